@@ -1,20 +1,46 @@
 from flask import Flask, request, jsonify
 from dotenv import load_dotenv
 import os, time
+import copy
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
 # import pandas as pd
 import asyncio
 import uuid
 import logging
-from scraper.apollo_scraper import enrich_single_company
+from scraper.apollo_scraper import enrich_companies_bulk, APOLLO_BULK_SIZE
 from selenium.webdriver.common.by import By
 import shutil
 from scraper.growjoScraper import GrowjoScraper
+from scraper.driver_pool import DriverPool, DRIVER_POOL_PREWARM
+from scraper.driver_resolver import driver_resolver
+from scraper.growjo_session import growjo_session
+from scraper.growjo_playwright import GrowjoPlaywrightScraper, GROWJO_PLAYWRIGHT_PAGES
+from scraper.resource_blocking import blocking_stats
+from scraper.growjo_catalog import growjo_catalog
+from scraper.growjo_batch import GrowjoBatchRunner, default_worker_count, GROWJO_PIPELINE, GROWJO_ENGINE
 from security import generate_token, token_required, VALID_USERS
-from scraper.apollo_people import find_best_person, enrich_person
+from scraper.apollo_people import resolve_best_person
+from scraper.apollo_cache import apollo_cache
+from jobs import JobManager
+from streaming import batch_response
+from batching import run_batch, APOLLO_MAX_WORKERS
+from enrichment import merge_enrichment, normalize_website
+from coalesce import SingleFlight, canonical_company, canonical_domain, group_duplicates
+from scraper.revenueScraper import get_company_revenue_from_growjo
 
 
 app = Flask(__name__)
 load_dotenv()
+job_manager = JobManager()
+# Warm Edge browsers shared by every Growjo scrape in this process
+driver_pool = DriverPool(headless=True)
+
+# Concurrent requests for the same company/domain share one upstream call
+apollo_org_flight = SingleFlight()
+apollo_person_flight = SingleFlight()
+growjo_flight = SingleFlight()
+revenue_flight = SingleFlight()
 
 @app.route("/", methods=["GET"])
 def health_check():
@@ -44,6 +70,23 @@ def login():
 def protected_test():
     return jsonify({"message": "This is a protected route"}), 200
 
+@app.route("/api/stats", methods=["GET"])
+def get_stats():
+    return jsonify({
+        "apollo_cache": apollo_cache.stats(),
+        "driver_pool": driver_pool.stats(),
+        "webdriver": driver_resolver.stats(),
+        "growjo_session": growjo_session.stats(),
+        "resource_blocking": blocking_stats.stats(),
+        "growjo_catalog": growjo_catalog.stats(),
+        "coalescing": {
+            "apollo_org": apollo_org_flight.stats(),
+            "apollo_person": apollo_person_flight.stats(),
+            "growjo": growjo_flight.stats(),
+            "revenue": revenue_flight.stats()
+        }
+    }), 200
+
 @app.route("/api/find-website", methods=["GET"])
 def get_website():
     company = request.args.get("company")
@@ -63,9 +106,41 @@ def get_revenue():
     if not company:
         return jsonify({"error": "Missing company parameter"}), 400
 
-    data = get_company_revenue_from_growjo(company)
+    data = revenue_flight.do(canonical_company(company), lambda: get_company_revenue_from_growjo(company))
+    data["company"] = company
     return jsonify(data)
 
+def apollo_domain_key(domain):
+    return canonical_domain(domain) or str(domain)
+
+def domain_error(domain):
+    """Per-item record for a batch entry that is not a usable domain, else None."""
+    if domain is not None and not isinstance(domain, str):
+        return {"domain": domain, "error": "Invalid domain (must be a string)"}
+    if not canonical_domain(domain):
+        return {"domain": domain, "error": "Missing domain"}
+    return None
+
+def enrich_domain_chunk(chunk_domains):
+    """Apollo org data for up to APOLLO_BULK_SIZE distinct domains, keyed by apollo_domain_key."""
+    by_key = {apollo_domain_key(domain): domain for domain in chunk_domains}
+    return apollo_org_flight.do_many(by_key, lambda keys: {
+        apollo_domain_key(domain): result
+        for domain, result in enrich_companies_bulk([by_key[key] for key in keys]).items()
+    })
+
+def resolve_person(domain):
+    led = []
+
+    def lookup():
+        led.append(True)
+        return resolve_best_person(domain)
+
+    record = apollo_person_flight.do(canonical_domain(domain), lookup)
+    if not led and isinstance(record, dict):
+        record["apollo_calls"] = 0  # served by another request's in-flight lookup
+    return record
+
 @app.route("/api/apollo-scrape-batch", methods=["POST"])
 def apollo_scrape_batch():
     data = request.get_json()
@@ -74,67 +149,202 @@ def apollo_scrape_batch():
     if not domains or not isinstance(domains, list):
         return jsonify({"error": "Missing or invalid 'domains' (must be a list)"}), 400
 
-    results = []
-    for domain in domains:
-        enriched_data = enrich_single_company(domain)
-        enriched_data["domain"] = domain  # always return domain
-        results.append(enriched_data)
+    # Entries that are not domains get their own error instead of failing a whole chunk
+    errors = {idx: error for idx, error in ((idx, domain_error(domain)) for idx, domain in enumerate(domains)) if error}
 
-    return jsonify(results)
+    # Duplicate domains are looked up once; one Apollo bulk call per chunk of
+    # distinct domains, chunks fanned out concurrently
+    groups = [indices for indices in group_duplicates(domains, canonical_domain).values() if indices[0] not in errors]
+    chunks = [groups[i:i + APOLLO_BULK_SIZE] for i in range(0, len(groups), APOLLO_BULK_SIZE)]
 
-@app.route("/api/scrape-growjo-batch", methods=["POST"])
-def scrape_growjo_batch():
-    try:
-        data_list = request.get_json()
+    def enrich_chunk(chunk):
+        return enrich_domain_chunk([domains[indices[0]] for indices in chunk])
 
-        # :rotating_light: Validate: must be a list
-        if not isinstance(data_list, list):
-            return jsonify({"error": "Expected a JSON array (list of companies)"}), 400
+    def on_error(chunk, e):
+        return {apollo_domain_key(domains[indices[0]]): {"error": str(e)} for indices in chunk}
 
-        # :rocket: Initialize scraper (always headless=False for now, you can change later)
-        scraper = GrowjoScraper(headless=True)
+    def records():
+        yield from errors.items()
+        for chunk_idx, chunk_results in run_batch(enrich_chunk, chunks, on_error=on_error):
+            for indices in chunks[chunk_idx]:
+                result = chunk_results.get(apollo_domain_key(domains[indices[0]])) or {"error": "No result"}
+                for idx in indices:
+                    enriched_data = copy.deepcopy(result)
+                    enriched_data["domain"] = domains[idx]  # always return domain
+                    yield idx, enriched_data
 
-        results = []
-        for idx, entry in enumerate(data_list, start=1):
-            company_name = entry.get("company") or entry.get("name")
+    return batch_response(records())
 
-            if not company_name:
-                error_msg = f"Missing 'company' or 'name' field at item {idx}"
-                print(f"[ERROR] {error_msg}")
-                results.append({
-                    "error": error_msg,
-                    "input_name": None
-                })
-                continue
+def growjo_entry_name(entry):
+    return entry.get("company") or entry.get("name") if isinstance(entry, dict) else None
 
-            try:
-                print(f"[INFO] Scraping company: {company_name}")
-                result = scraper.scrape_full_pipeline(company_name)
+def scrape_growjo_entry(scraper, idx, entry):
+    """Run the Growjo pipeline for one batch entry, never raising."""
+    company_name = growjo_entry_name(entry)
 
-                if not result:
-                    result = {
-                        "error": f"Scraping returned no data for '{company_name}'",
-                        "company_name": company_name
-                    }
+    if not company_name:
+        error_msg = f"Missing 'company' or 'name' field at item {idx}"
+        print(f"[ERROR] {error_msg}")
+        return {
+            "error": error_msg,
+            "input_name": None
+        }
 
-                result["input_name"] = company_name
-                results.append(result)
+    try:
+        print(f"[INFO] Scraping company: {company_name}")
+        result = growjo_flight.do(canonical_company(company_name), lambda: scraper.scrape_full_pipeline(company_name))
+
+        if not result:
+            result = {
+                "error": f"Scraping returned no data for '{company_name}'",
+                "company_name": company_name
+            }
+
+        result["input_name"] = company_name
+        return result
+
+    except Exception as scrape_error:
+        error_msg = f"Scraping failed for '{company_name}': {str(scrape_error)}"
+        print(f"[ERROR] {error_msg}")
+        return {
+            "error": error_msg,
+            "input_name": company_name
+        }
+
+def growjo_runner():
+    if GROWJO_ENGINE == "playwright":
+        # One shared async browser; worker threads only wait on its pages
+        return GrowjoBatchRunner(lambda: GrowjoPlaywrightScraper(headless=True), workers=GROWJO_PLAYWRIGHT_PAGES)
+    # Every worker holds two pooled browsers, so the pool bounds the worker count
+    workers = min(default_worker_count(local_browsers=not driver_pool.remote), max(1, driver_pool.size // 2))
+    return GrowjoBatchRunner(lambda: GrowjoScraper(headless=True, pool=driver_pool), workers=workers)
+
+def scrape_growjo_entries(entries, on_start=None):
+    """Yield (index, result) for every entry as workers finish, scraping each distinct company only once."""
+    groups = group_duplicates(entries, lambda entry: canonical_company(growjo_entry_name(entry)))
+    duplicates = {indices[0]: indices for indices in groups.values()}
+
+    def start(first):
+        if on_start:
+            for idx in duplicates[first]:
+                on_start(idx)
+
+    def scrape(scraper, task):
+        first, entry = task
+        return scrape_growjo_entry(scraper, first + 1, entry)
+
+    def pipeline(scraper, worker_tasks):
+        # Pipelined companies join growjo_flight too: the ones another request is
+        # already scraping are not scraped again but answered when it lands
+        owned, joined = {}, {}
+
+        def owned_names():
+            for first, (_, entry) in worker_tasks:
+                name = growjo_entry_name(entry)
+                call, owner = growjo_flight.join(canonical_company(name))
+                if owner:
+                    owned[first] = call
+                    yield first, name
+                else:
+                    joined[first] = call
+
+        def joined_result(first, timeout=None):
+            try:
+                result = growjo_flight.wait(joined[first], timeout)
+            except Exception as e:
+                result = {"error": f"Scraping failed for '{growjo_entry_name(entries[first])}': {str(e)}"}
+            if result is None and timeout is None:
+                result = {"error": f"Scraping returned no data for '{growjo_entry_name(entries[first])}'"}
+            if result is not None:
+                del joined[first]
+                result["input_name"] = growjo_entry_name(entries[first])
+            return result
+
+        try:
+            for first, result in scraper.scrape_pipelined(owned_names()):
+                result["input_name"] = growjo_entry_name(entries[first])
+                yield first, result
+                # The runner kept the result (no crash retry): share it with waiting requests
+                growjo_flight.finish(canonical_company(growjo_entry_name(entries[first])), owned.pop(first), result)
+                for other in list(joined):
+                    result = joined_result(other, timeout=0)
+                    if result is not None:
+                        yield other, result
+            for other in list(joined):
+                yield other, joined_result(other)
+        finally:
+            for first, call in owned.items():
+                growjo_flight.finish(canonical_company(growjo_entry_name(entries[first])), call,
+                                     error=RuntimeError("Growjo scrape was interrupted"))
+
+    tasks = []
+    for first in duplicates:
+        if growjo_entry_name(entries[first]):
+            tasks.append((first, (first, entries[first])))
+        else:
+            start(first)
+            yield first, scrape_growjo_entry(None, first + 1, entries[first])
+
+    runner = growjo_runner()
+    results = runner.run(tasks, on_start=start, pipeline=pipeline) if GROWJO_PIPELINE and GROWJO_ENGINE == "selenium" \
+        else runner.run(tasks, scrape, on_start=start)
+    for first, result in results:
+        yield first, result
+        for idx in duplicates[first][1:]:
+            duplicate = copy.deepcopy(result)
+            duplicate["input_name"] = growjo_entry_name(entries[idx])
+            yield idx, duplicate
+
+def run_growjo_job(job):
+    entries = [item["input"] for item in job.items]
+    for idx, result in scrape_growjo_entries(entries, on_start=job.start_item):
+        job.finish_item(idx, result)
 
-            except Exception as scrape_error:
-                error_msg = f"Scraping failed for '{company_name}': {str(scrape_error)}"
-                print(f"[ERROR] {error_msg}")
-                results.append({
-                    "error": error_msg,
-                    "input_name": company_name
-                })
+@app.route("/api/scrape-growjo-batch", methods=["POST"])
+def scrape_growjo_batch():
+    try:
+        data_list = request.get_json()
 
-        scraper.close()
-        return jsonify(results), 200
+        # :rotating_light: Validate: must be a list
+        if not isinstance(data_list, list):
+            return jsonify({"error": "Expected a JSON array (list of companies)"}), 400
+
+        # :rocket: Companies are spread over parallel headless scrapers
+        return batch_response(scrape_growjo_entries(data_list))
 
     except Exception as e:
         print(f"[FATAL ERROR] {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route("/api/scrape-growjo-batch/jobs", methods=["POST"])
+def submit_growjo_job():
+    data_list = request.get_json()
+
+    if not isinstance(data_list, list):
+        return jsonify({"error": "Expected a JSON array (list of companies)"}), 400
+
+    job = job_manager.submit("growjo", data_list, run_growjo_job)
+    return jsonify({
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/jobs/{job.id}",
+        "results_url": f"/api/jobs/{job.id}/results"
+    }), 202
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def get_job_status(job_id):
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict()), 200
+
+@app.route("/api/jobs/<job_id>/results", methods=["GET"])
+def get_job_results(job_id):
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict(include_results=True)), 200
+
 @app.route("/api/find-best-person-batch", methods=["POST"])
 def api_find_best_person_batch():
     try:
@@ -144,48 +354,137 @@ def api_find_best_person_batch():
         if not domains or not isinstance(domains, list):
             return jsonify({"error": "Missing or invalid 'domains' field"}), 400
 
-        results = []
-        for domain in domains:
-            best_person = find_best_person(domain)
-            if not best_person:
-                results.append({
-                    "domain": domain,
-                    "error": "No person found"
-                })
-                continue
+        def on_error(domain, e):
+            return {"domain": domain, "error": str(e)}
 
-            enriched = enrich_person(best_person.get("first_name", ""), best_person.get("last_name", ""), domain)
-
-            if not enriched:
-                results.append({
-                    "domain": domain,
-                    "first_name": best_person.get("first_name", ""),
-                    "last_name": best_person.get("last_name", ""),
-                    "title": best_person.get("title", ""),
-                    "email": "email_not_found@domain.com",
-                    "phone_number": "No phone found",
-                    "linkedin_url": best_person.get("linkedin_url", ""),
-                    "company": best_person.get("organization", {}).get("name", "")
-                })
-                continue
+        # Blank or non-string entries get their own error and never reach Apollo
+        errors = {idx: error for idx, error in ((idx, domain_error(domain)) for idx, domain in enumerate(domains)) if error}
+        lookups = [idx for idx in range(len(domains)) if idx not in errors]
 
-            results.append({
-                "domain": domain,
-                "first_name": enriched.get("first_name", best_person.get("first_name", "")),
-                "last_name": enriched.get("last_name", best_person.get("last_name", "")),
-                "title": enriched.get("title", best_person.get("title", "")),
-                "email": enriched.get("email", "email_not_found@domain.com"),
-                "phone_number": enriched.get("phone_numbers", [{}])[0].get("sanitized_number", "No phone found") if enriched.get("phone_numbers") else "No phone found",
-                "linkedin_url": enriched.get("linkedin_url", best_person.get("linkedin_url", "")),
-                "company": enriched.get("organization_name", best_person.get("organization", {}).get("name", ""))
-            })
+        def records():
+            yield from errors.items()
+            seen = set()
+            for pos, record in run_batch(resolve_person, [domains[idx] for idx in lookups],
+                                         on_error=on_error, key=canonical_domain):
+                idx = lookups[pos]
+                record["domain"] = domains[idx]
+                key = canonical_domain(domains[idx])
+                if key in seen:
+                    record["apollo_calls"] = 0  # duplicate served from the first lookup
+                seen.add(key)
+                yield idx, record
 
-        return jsonify(results), 200
+        return batch_response(records())
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def future_result(future, default=None):
+    if future is None:
+        return default
+    try:
+        return future.result()
+    except Exception as e:
+        return {"error": str(e)}
+
+def enrich_rows(rows):
+    """Yield (index, merged_row) as soon as every provider has finished for a row.
+
+    Apollo org (bulk), Apollo person and Growjo lookups for all rows are
+    started up front and run concurrently, so each row waits for its
+    slowest provider rather than for whole provider batches in sequence.
+    """
+    domains = [normalize_website(row.get("Website")) for row in rows]
+    companies = [row.get("Company") for row in rows]
+
+    apollo_pool = ThreadPoolExecutor(max_workers=APOLLO_MAX_WORKERS, thread_name_prefix="enrich-apollo")
+    # Growjo companies go through the parallel scraper workers; each one
+    # resolves a future so rows can wait on it like on the Apollo lookups
+    growjo_companies = []
+    growjo_futures = {}
+    for company in companies:
+        company_key = canonical_company(company)
+        if company_key and company_key not in growjo_futures:
+            growjo_futures[company_key] = Future()
+            growjo_companies.append(company)
+    growjo_stop = threading.Event()
+
+    def feed_growjo():
+        results = scrape_growjo_entries([{"company": company} for company in growjo_companies])
+        try:
+            for idx, result in results:
+                growjo_futures[canonical_company(growjo_companies[idx])].set_result(result)
+                if growjo_stop.is_set():
+                    break
+        finally:
+            results.close()
+            for future in growjo_futures.values():
+                if not future.done():
+                    future.set_exception(RuntimeError("Growjo scraping stopped"))
+
+    domain_by_key = {}
+    for domain in domains:
+        if domain:
+            domain_by_key.setdefault(apollo_domain_key(domain), domain)
+    keys = list(domain_by_key)
+
+    org_futures, person_futures = {}, {}
+    for i in range(0, len(keys), APOLLO_BULK_SIZE):
+        chunk = keys[i:i + APOLLO_BULK_SIZE]
+        future = apollo_pool.submit(enrich_domain_chunk, [domain_by_key[key] for key in chunk])
+        for key in chunk:
+            org_futures[key] = future
+    for key in keys:
+        person_futures[key] = apollo_pool.submit(resolve_person, domain_by_key[key])
+    if growjo_companies:
+        threading.Thread(target=feed_growjo, daemon=True).start()
+
+    def row_futures(idx):
+        domain_key = apollo_domain_key(domains[idx]) if domains[idx] else None
+        return (org_futures.get(domain_key), person_futures.get(domain_key),
+                growjo_futures.get(canonical_company(companies[idx])))
+
+    pending = {idx: [f for f in row_futures(idx) if f] for idx in range(len(rows))}
+    try:
+        while pending:
+            ready = [idx for idx, futures in pending.items() if all(f.done() for f in futures)]
+            if not ready:
+                wait({f for futures in pending.values() for f in futures if not f.done()}, return_when=FIRST_COMPLETED)
+                continue
+
+            for idx in ready:
+                del pending[idx]
+                org_future, person_future, growjo_future = row_futures(idx)
+                org_results = future_result(org_future, {})
+                apollo = org_results.get(apollo_domain_key(domains[idx]), {}) if "error" not in org_results else org_results
+                person = future_result(person_future, {})
+                growjo = future_result(growjo_future, {})
+
+                merged = merge_enrichment(rows[idx], apollo, person, growjo)
+                errors = {name: result["error"] for name, result in
+                          (("apollo", apollo), ("apollo_person", person), ("growjo", growjo))
+                          if isinstance(result, dict) and result.get("error")}
+                if errors:
+                    merged["errors"] = errors
+                yield idx, merged
+    finally:
+        apollo_pool.shutdown(wait=False, cancel_futures=True)
+        growjo_stop.set()
+
+@app.route("/api/enrich-batch", methods=["POST"])
+def enrich_batch():
+    data = request.get_json()
+    rows = data.get("rows") if isinstance(data, dict) else data
+
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        return jsonify({"error": "Missing or invalid 'rows' (must be a list of objects)"}), 400
+
+    return batch_response(enrich_rows(rows))
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5050))  # Render will provide the port
+    # With the debug reloader only the child process (WERKZEUG_RUN_MAIN) serves requests
+    if DRIVER_POOL_PREWARM and os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        driver_pool.prewarm()
     app.run(host="0.0.0.0", port=port, debug=True)
 
@@ -0,0 +1,42 @@
+import os
+import copy
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from coalesce import group_duplicates
+
+APOLLO_MAX_WORKERS = int(os.getenv("APOLLO_MAX_WORKERS", 8))
+
+
+def run_batch(func, items, max_workers=APOLLO_MAX_WORKERS, on_error=None, key=None):
+    """Run func(item) for every item with at most max_workers calls in flight.
+
+    Yields (index, result) pairs as calls complete; callers reassemble the
+    input order from the index. An exception only affects its own item and
+    is turned into on_error(item, exc), or {"error": str(exc)} by default.
+    With key=..., items sharing a key are dispatched once and the result is
+    fanned back out to every duplicate index.
+    """
+    items = list(items)
+    if not items:
+        return
+
+    groups = list(group_duplicates(items, key or (lambda item: None)).values())
+
+    def call(item):
+        try:
+            return func(item)
+        except Exception as e:
+            print(f"[ERROR] Batch item {item!r} failed: {str(e)}")
+            return on_error(item, e) if on_error else {"error": str(e)}
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(groups))), thread_name_prefix="batch")
+    try:
+        futures = {executor.submit(call, items[indices[0]]): indices for indices in groups}
+        for future in as_completed(futures):
+            result = future.result()
+            indices = futures[future]
+            yield indices[0], result
+            for idx in indices[1:]:
+                yield idx, copy.deepcopy(result)
+    finally:
+        # Stop queued work if the consumer goes away (e.g. a closed stream)
+        executor.shutdown(wait=False, cancel_futures=True)
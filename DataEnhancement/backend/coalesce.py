@@ -0,0 +1,134 @@
+import re
+import copy
+import threading
+from collections import OrderedDict
+from scraper.apollo_scraper import normalize_domain
+
+
+def canonical_domain(domain):
+    """Normalized domain key, or None for non-string or blank input (never grouped with anything)."""
+    return normalize_domain(domain) or None
+
+
+def canonical_company(name):
+    """Case, punctuation and whitespace-insensitive company key ('Smith & Co.' -> 'smith and co')."""
+    if not isinstance(name, str) or not name.strip():
+        return None
+    name = name.lower().replace("&", " and ")
+    name = re.sub(r"[^\w\s]", " ", name)
+    return " ".join(name.split())
+
+
+def group_duplicates(items, key):
+    """Map each distinct key to the indices of the items sharing it, in first-seen order.
+
+    Items whose key is None are never merged with anything.
+    """
+    groups = OrderedDict()
+    for idx, item in enumerate(items):
+        item_key = key(item)
+        groups.setdefault(item_key if item_key is not None else ("__unique__", idx), []).append(idx)
+    return groups
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one in-flight computation.
+
+    The first caller for a key runs the work; callers arriving while it is
+    running wait and receive a copy of the same result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {"calls": 0, "coalesced": 0}
+
+    def _claim(self, keys):
+        owned, shared = {}, {}
+        with self._lock:
+            for key in keys:
+                self._stats["calls"] += 1
+                if key in self._calls:
+                    self._stats["coalesced"] += 1
+                    shared[key] = self._calls[key]
+                else:
+                    owned[key] = self._calls[key] = _Call()
+        return owned, shared
+
+    def _release(self, calls):
+        with self._lock:
+            for key in calls:
+                self._calls.pop(key, None)
+        for call in calls.values():
+            call.done.set()
+
+    def do(self, key, func):
+        if key is None:
+            return func()
+        return self.do_many([key], lambda keys: {key: func()})[key]
+
+    def do_many(self, keys, func):
+        """Resolve several keys at once; func(owned_keys) must return {key: result}.
+
+        Only keys not already in flight elsewhere are passed to func, so batch
+        calls (e.g. Apollo bulk enrichment) coalesce per key as well.
+        """
+        keys = list(dict.fromkeys(keys))
+        owned, shared = self._claim(keys)
+        results = {}
+
+        if owned:
+            try:
+                computed = func(list(owned))
+                for key, call in owned.items():
+                    # Waiters copy from a private snapshot so the owner may mutate its result
+                    call.result = copy.deepcopy(computed.get(key))
+                    results[key] = computed.get(key)
+            except Exception as e:
+                for call in owned.values():
+                    call.error = e
+                raise
+            finally:
+                self._release(owned)
+
+        for key, call in shared.items():
+            call.done.wait()
+            if call.error:
+                raise call.error
+            results[key] = copy.deepcopy(call.result)
+
+        return results
+
+    def join(self, key):
+        """(call, owner) for work that finishes later, e.g. inside a pipeline.
+
+        The owner must hand the call to finish(); everyone else gets the call
+        already in flight and passes it to wait().
+        """
+        owned, shared = self._claim([key])
+        return (owned[key], True) if owned else (shared[key], False)
+
+    def finish(self, key, call, result=None, error=None):
+        call.result = copy.deepcopy(result)
+        call.error = error
+        self._release({key: call})
+
+    @staticmethod
+    def wait(call, timeout=None):
+        """The flight's result once it lands; None if it is still running after timeout."""
+        if not call.done.wait(timeout):
+            return None
+        if call.error:
+            raise call.error
+        return copy.deepcopy(call.result)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._calls))
@@ -0,0 +1,78 @@
+STANDARD_COLUMNS = [
+    'Company', 'City', 'State', 'First Name', 'Last Name', 'Email', 'Title', 'Website',
+    'LinkedIn URL', 'Industry ', 'Revenue', 'Product/Service Category',
+    'Business Type (B2B, B2B2C) ', 'Associated Members', 'Employees count', 'Rev Source', 'Year Founded',
+    "Owner's LinkedIn", 'Owner Age', 'Phone Number', 'Additional Notes', 'Score',
+    'Email customization #1', 'Subject Line #1', 'Email Customization #2', 'Subject Line #2',
+    'LinkedIn Customization #1', 'LinkedIn Customization #2', 'Reasoning for r//y/g'
+]
+
+# Placeholder values the providers return when they have nothing
+MISSING_VALUES = {"", "not found", "email_not_found@domain.com", "no phone found"}
+
+
+def is_blank(value):
+    return value is None or str(value).strip() == "" or str(value).strip().lower() == "nan"
+
+
+def found(value):
+    """Return value unless it is empty or a provider placeholder."""
+    if is_blank(value) or str(value).strip().lower() in MISSING_VALUES:
+        return ""
+    return value
+
+
+def normalize_website(website):
+    if not isinstance(website, str):
+        return ""
+    return website.replace("http://", "").replace("https://", "").replace("www.", "").strip().lower()
+
+
+def split_name(full_name):
+    parts = (full_name or "").strip().split()
+    if len(parts) == 0:
+        return "", ""
+    elif len(parts) == 1:
+        return parts[0], ""
+    else:
+        return parts[0], " ".join(parts[1:])
+
+
+def merge_enrichment(row, apollo, person, growjo):
+    """Fill the blank standard columns of an uploaded row from the provider results.
+
+    Existing values are never overwritten. Growjo decision-maker data wins
+    over Apollo person data, matching the upload page's original rules.
+    """
+    apollo, person, growjo = apollo or {}, person or {}, growjo or {}
+    merged = {col: row.get(col, "") for col in STANDARD_COLUMNS}
+    merged.update({col: value for col, value in row.items() if col not in merged})
+
+    def fill(col, *candidates):
+        if is_blank(row.get(col)):
+            merged[col] = next((found(value) for value in candidates if found(value)), "")
+
+    if is_blank(row.get("Revenue")):
+        revenue = found(apollo.get("annual_revenue_printed"))
+        merged["Revenue"] = f"${revenue}" if revenue else ""
+        merged["Rev Source"] = "Apollo" if revenue else ""
+
+    fill("Year Founded", apollo.get("founded_year"))
+    if not normalize_website(row.get("Website")):
+        merged["Website"] = found(apollo.get("website_url"))
+    fill("LinkedIn URL", apollo.get("linkedin_url"))
+    fill("Industry ", growjo.get("industry"))
+    fill("Associated Members")
+    fill("Employees count", apollo.get("employee_count"))
+    fill("Product/Service Category", apollo.get("keywords"))
+
+    fill("Email", growjo.get("decider_email"), person.get("email"))
+    fill("Phone Number", growjo.get("decider_phone"), person.get("phone_number"))
+    fill("Owner's LinkedIn", growjo.get("decider_linkedin"), person.get("linkedin_url"))
+    fill("Title", growjo.get("decider_title"), person.get("title"))
+
+    first_name, last_name = split_name(found(growjo.get("decider_name")))
+    fill("First Name", first_name, person.get("first_name"))
+    fill("Last Name", last_name, person.get("last_name"))
+
+    return merged
@@ -0,0 +1,124 @@
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", 3600))
+
+
+class Job:
+    """A batch job with per-item status, results and timings."""
+
+    def __init__(self, kind, items):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.items = [
+            {"index": idx, "input": item, "status": "pending", "result": None, "elapsed": None}
+            for idx, item in enumerate(items)
+        ]
+        self._item_started = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            self.status = "running"
+            self.started_at = time.time()
+
+    def finish(self, error=None):
+        """Record the outcome; status and finished_at change together under the lock results use."""
+        with self._lock:
+            self.error = error
+            self.status = "failed" if error else "finished"
+            self.finished_at = time.time()
+
+    def start_item(self, idx):
+        with self._lock:
+            self.items[idx]["status"] = "running"
+            self._item_started[idx] = time.time()
+
+    def finish_item(self, idx, result):
+        with self._lock:
+            started = self._item_started.pop(idx, None)
+            item = self.items[idx]
+            item["status"] = "failed" if isinstance(result, dict) and result.get("error") else "done"
+            item["result"] = result
+            item["elapsed"] = round(time.time() - started, 2) if started else None
+
+    def progress(self):
+        counts = {"pending": 0, "running": 0, "done": 0, "failed": 0}
+        for item in self.items:
+            counts[item["status"]] += 1
+        counts["total"] = len(self.items)
+        counts["completed"] = counts["done"] + counts["failed"]
+        return counts
+
+    def to_dict(self, include_results=False):
+        with self._lock:
+            finished_at = self.finished_at or time.time()
+            data = {
+                "job_id": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "error": self.error,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "elapsed": round(finished_at - self.started_at, 2) if self.started_at else None,
+                "progress": self.progress(),
+                "items": [
+                    {key: value for key, value in item.items() if include_results or key != "result"}
+                    for item in self.items
+                ],
+            }
+        return data
+
+
+class JobManager:
+    """Runs jobs on a background worker pool so API requests return immediately."""
+
+    def __init__(self, max_workers=JOB_WORKERS, retention_seconds=JOB_RETENTION_SECONDS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._retention_seconds = retention_seconds
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, items, runner):
+        """Queue runner(job) for execution and return the new Job.
+
+        The runner walks job.items and reports progress through
+        job.start_item / job.finish_item.
+        """
+        self._prune()
+        job = Job(kind, items)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, runner)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, runner):
+        job.start()
+        try:
+            runner(job)
+        except Exception as e:
+            print(f"[ERROR] Job {job.id} failed: {str(e)}")
+            job.finish(str(e) or type(e).__name__)
+        else:
+            job.finish()
+
+    def _prune(self):
+        cutoff = time.time() - self._retention_seconds
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
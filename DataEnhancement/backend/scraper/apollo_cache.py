@@ -0,0 +1,133 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+APOLLO_CACHE_ENABLED = os.getenv("APOLLO_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+APOLLO_CACHE_PATH = os.getenv(
+    "APOLLO_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "apollo_cache.sqlite3")
+)
+APOLLO_CACHE_ORG_TTL = int(os.getenv("APOLLO_CACHE_ORG_TTL", 7 * 24 * 3600))
+APOLLO_CACHE_PERSON_TTL = int(os.getenv("APOLLO_CACHE_PERSON_TTL", 3 * 24 * 3600))
+# Serve expired entries immediately and refresh them in the background
+APOLLO_CACHE_STALE_WHILE_REVALIDATE = os.getenv("APOLLO_CACHE_STALE_WHILE_REVALIDATE", "true").lower() in ("1", "true", "yes")
+# Entries older than TTL + this are treated as misses even in stale-while-revalidate mode
+APOLLO_CACHE_MAX_STALE = int(os.getenv("APOLLO_CACHE_MAX_STALE", 30 * 24 * 3600))
+
+
+def is_cacheable(value):
+    """Only successful lookups are cached; errors and empty results are retried."""
+    if not value:
+        return False
+    return not (isinstance(value, dict) and value.get("error"))
+
+
+class ApolloCache:
+    """SQLite-backed cache for Apollo responses with TTL and stale-while-revalidate."""
+
+    def __init__(self, path=APOLLO_CACHE_PATH, enabled=APOLLO_CACHE_ENABLED,
+                 stale_while_revalidate=APOLLO_CACHE_STALE_WHILE_REVALIDATE, max_stale=APOLLO_CACHE_MAX_STALE):
+        self.enabled = enabled
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_stale = max_stale
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "writes": 0, "refreshes": 0, "refresh_errors": 0}
+        self._conn = None
+
+        if self.enabled:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS apollo_cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, stored_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            self._conn.commit()
+
+    def _count(self, stat):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def lookup(self, namespace, key, ttl, loader=None):
+        """Return the cached value for (namespace, key), or None on a miss.
+
+        In stale-while-revalidate mode an expired entry is still returned and,
+        if a loader is given, refreshed on a background thread.
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM apollo_cache WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+
+        if row:
+            value, stored_at = row
+            age = time.time() - stored_at
+            if age <= ttl:
+                self._count("hits")
+                return json.loads(value)
+            if self.stale_while_revalidate and age <= ttl + self.max_stale:
+                self._count("stale_hits")
+                if loader:
+                    self._refresh_in_background(namespace, key, loader)
+                return json.loads(value)
+
+        self._count("misses")
+        return None
+
+    def store(self, namespace, key, value):
+        if not self.enabled or not is_cacheable(value):
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO apollo_cache (namespace, key, value, stored_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), time.time())
+            )
+            self._conn.commit()
+            self._stats["writes"] += 1
+
+    def fetch(self, namespace, key, ttl, loader):
+        """Return the cached value or call loader(), caching a successful result."""
+        value = self.lookup(namespace, key, ttl, loader)
+        if value is not None:
+            return value
+        value = loader()
+        self.store(namespace, key, value)
+        return value
+
+    def _refresh_in_background(self, namespace, key, loader):
+        with self._lock:
+            if (namespace, key) in self._refreshing:
+                return
+            self._refreshing.add((namespace, key))
+
+        def refresh():
+            try:
+                self.store(namespace, key, loader())
+                self._count("refreshes")
+            except Exception as e:
+                print(f"[ERROR] Apollo cache refresh failed for {namespace}:{key}: {str(e)}")
+                self._count("refresh_errors")
+            finally:
+                with self._lock:
+                    self._refreshing.discard((namespace, key))
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = self._conn.execute("SELECT COUNT(*) FROM apollo_cache").fetchone()[0] if self._conn else 0
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["stale_hits"]) / lookups, 3) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        stats["stale_while_revalidate"] = self.stale_while_revalidate
+        return stats
+
+
+apollo_cache = ApolloCache()
@@ -1,6 +1,8 @@
 from flask import Flask, request, jsonify
 import requests
 import os
+from .apollo_cache import apollo_cache, APOLLO_CACHE_PERSON_TTL
+from .apollo_scraper import normalize_domain
 
 app = Flask(__name__)
 
@@ -23,7 +25,14 @@ def get_priority_rank(title):
             return idx
     return len(priority_titles) + 1
 
+def _person_match_key(first_name, last_name, domain):
+    return f"{normalize_domain(domain)}|{(first_name or '').strip().lower()} {(last_name or '').strip().lower()}"
+
 def enrich_person(first_name, last_name, domain):
+    return apollo_cache.fetch("person_match", _person_match_key(first_name, last_name, domain), APOLLO_CACHE_PERSON_TTL,
+                              lambda: _fetch_enriched_person(first_name, last_name, domain))
+
+def _fetch_enriched_person(first_name, last_name, domain):
     headers = {
         "accept": "application/json",
         "Content-Type": "application/json",
@@ -45,7 +54,7 @@ def enrich_person(first_name, last_name, domain):
 
     return response.json().get("person", {})
 
-def find_best_person(domain):
+def _fetch_best_person(domain):
     params = {
         "person_titles[]": "",
         "person_seniorities[]": ["owner", "founder", "c_suite", "vp", "director", "manager"],
@@ -71,34 +80,47 @@ def find_best_person(domain):
         return None
 
     people_sorted = sorted(people, key=lambda x: get_priority_rank(x.get("title")))
-    best_person = people_sorted[0]
-
-    # --- Try to enrich ---
-    enriched = enrich_person(
-        first_name=best_person.get("first_name", ""),
-        last_name=best_person.get("last_name", ""),
-        domain=domain
-    )
-
-    # --- Combine original + enriched ---
-    combined_result = {
-        "company": best_person.get("organization", {}).get("name", ""),
+    return people_sorted[0]
+
+def resolve_best_person(domain):
+    """Search, rank and enrich the best contact for a domain in a single pass.
+
+    Each Apollo endpoint is hit at most once per domain; "apollo_calls" in the
+    returned record counts the upstream requests made (cache hits are free).
+    """
+    calls = {"count": 0}
+
+    def counted(loader):
+        def wrapped():
+            calls["count"] += 1
+            return loader()
+        return wrapped
+
+    best_person = apollo_cache.fetch("person_search", normalize_domain(domain), APOLLO_CACHE_PERSON_TTL,
+                                     counted(lambda: _fetch_best_person(domain)))
+    if not best_person:
+        return {
+            "domain": domain,
+            "error": "No person found",
+            "apollo_calls": calls["count"]
+        }
+
+    first_name = best_person.get("first_name", "")
+    last_name = best_person.get("last_name", "")
+    enriched = apollo_cache.fetch("person_match", _person_match_key(first_name, last_name, domain), APOLLO_CACHE_PERSON_TTL,
+                                  counted(lambda: _fetch_enriched_person(first_name, last_name, domain))) or {}
+
+    phone_numbers = enriched.get("phone_numbers") or []
+    organization = best_person.get("organization") or {}
+
+    return {
         "domain": domain,
-        "first_name": best_person.get("first_name", ""),
-        "last_name": best_person.get("last_name", ""),
-        "title": best_person.get("title", ""),
-        "linkedin_url": best_person.get("linkedin_url", ""),
-        "email": best_person.get("email", ""),
-        "phone_number": best_person.get("organization", {}).get("primary_phone", {}).get("sanitized_number", "No phone found"),
+        "first_name": enriched.get("first_name") or first_name,
+        "last_name": enriched.get("last_name") or last_name,
+        "title": enriched.get("title") or best_person.get("title", ""),
+        "email": enriched.get("email") or best_person.get("email") or "email_not_found@domain.com",
+        "phone_number": phone_numbers[0].get("sanitized_number", "No phone found") if phone_numbers else "No phone found",
+        "linkedin_url": enriched.get("linkedin_url") or best_person.get("linkedin_url", ""),
+        "company": enriched.get("organization_name") or organization.get("name", ""),
+        "apollo_calls": calls["count"]
     }
-
-    # Override with enriched fields if available
-    if enriched:
-        if enriched.get("email"):
-            combined_result["email"] = enriched["email"]
-        if enriched.get("linkedin_url"):
-            combined_result["linkedin_url"] = enriched["linkedin_url"]
-        if enriched.get("phone_number"):
-            combined_result["phone_number"] = enriched["phone_number"]
-
-    return combined_result
@@ -2,44 +2,112 @@ from flask import Flask, request, jsonify
 import requests
 import os
 from dotenv import load_dotenv
+from .apollo_cache import apollo_cache, APOLLO_CACHE_ORG_TTL
 
 load_dotenv()
 app = Flask(__name__)
 
 APOLLO_API_KEY = os.getenv("APOLLO_API_KEY")
+APOLLO_ENRICH_URL = "https://api.apollo.io/api/v1/organizations/enrich"
+APOLLO_BULK_ENRICH_URL = "https://api.apollo.io/api/v1/organizations/bulk_enrich"
+APOLLO_BULK_SIZE = 10  # Apollo accepts at most 10 domains per bulk call
 
-def enrich_single_company(domain):
-    """Call Apollo API and extract founded_year, linkedin_url, keywords, annual_revenue_printed, website_url, employee_count."""
-    url = "https://api.apollo.io/api/v1/organizations/enrich"
-    headers = {
+def _headers():
+    return {
         "accept": "application/json",
         "Cache-Control": "no-cache",
         "Content-Type": "application/json",
         "X-Api-Key": APOLLO_API_KEY
     }
+
+def normalize_domain(domain):
+    """Reduce 'https://www.Example.com/' style input to 'example.com'; "" for anything that is not a string."""
+    if not domain or not isinstance(domain, str):
+        return ""
+    domain = domain.strip().lower()
+    for prefix in ("http://", "https://"):
+        if domain.startswith(prefix):
+            domain = domain[len(prefix):]
+    if domain.startswith("www."):
+        domain = domain[4:]
+    return domain.split("/")[0]
+
+def _format_organization(org):
+    """Extract founded_year, linkedin_url, keywords, annual_revenue_printed, website_url, employee_count."""
+    keywords_list = org.get("keywords", [])
+    return {
+        "founded_year": org.get("founded_year", ""),
+        "linkedin_url": org.get("linkedin_url", ""),
+        "keywords": ", ".join(keywords_list) if keywords_list else "",
+        "annual_revenue_printed": org.get("annual_revenue_printed", ""),
+        "website_url": org.get("website_url", ""),
+        "employee_count": org.get("estimated_num_employees", "")
+    }
+
+def enrich_single_company(domain):
+    """Call Apollo API and extract founded_year, linkedin_url, keywords, annual_revenue_printed, website_url, employee_count."""
+    return apollo_cache.fetch("org", normalize_domain(domain), APOLLO_CACHE_ORG_TTL,
+                              lambda: _fetch_single_company(domain))
+
+def _fetch_single_company(domain):
     params = {"domain": domain}
-    
+
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = requests.get(APOLLO_ENRICH_URL, headers=_headers(), params=params)
         if response.status_code == 200:
             org = response.json().get("organization", {})
-            founded_year = org.get("founded_year", "")
-            linkedin_url = org.get("linkedin_url", "")
-            keywords_list = org.get("keywords", [])
-            keywords_combined = ", ".join(keywords_list) if keywords_list else ""
-            annual_revenue_printed = org.get("annual_revenue_printed", "")
-            website_url = org.get("website_url", "")
-            employee_count = org.get("estimated_num_employees", "")
-
-            return {
-                "founded_year": founded_year,
-                "linkedin_url": linkedin_url,
-                "keywords": keywords_combined,
-                "annual_revenue_printed": annual_revenue_printed,
-                "website_url": website_url,
-                "employee_count": employee_count
-            }
+            return _format_organization(org)
         else:
             return {"error": f"Status {response.status_code}"}
     except Exception as e:
         return {"error": str(e)}
+
+def enrich_companies_bulk(domains):
+    """Enrich up to APOLLO_BULK_SIZE domains with a single Apollo bulk call.
+
+    Returns {domain: result} for every input domain. Cached domains skip the
+    request; domains the bulk call did not return (or all of them, if the
+    call fails) fall back to single organizations/enrich calls.
+    """
+    results = {}
+    wanted = {}
+    for domain in domains:
+        key = normalize_domain(domain)
+        cached = apollo_cache.lookup("org", key, APOLLO_CACHE_ORG_TTL,
+                                     lambda domain=domain: _fetch_single_company(domain))
+        if cached is not None:
+            results[domain] = cached
+        else:
+            wanted.setdefault(key, []).append(domain)
+
+    if not wanted:
+        return results
+
+    try:
+        params = {"domains[]": list(wanted)}
+        response = requests.post(APOLLO_BULK_ENRICH_URL, headers=_headers(), params=params)
+        if response.status_code == 200:
+            for org in response.json().get("organizations") or []:
+                if not org:
+                    continue
+                formatted = _format_organization(org)
+                for key in (org.get("primary_domain"), org.get("website_url")):
+                    key = normalize_domain(key)
+                    if key in wanted and wanted[key][0] not in results:
+                        apollo_cache.store("org", key, formatted)
+                    for domain in wanted.get(key, []):
+                        results.setdefault(domain, dict(formatted))
+        else:
+            print(f"[ERROR] Apollo bulk enrich returned status {response.status_code}, falling back to single calls")
+    except Exception as e:
+        print(f"[ERROR] Apollo bulk enrich failed, falling back to single calls: {str(e)}")
+
+    for key, key_domains in wanted.items():
+        if key_domains[0] in results:
+            continue
+        fetched = _fetch_single_company(key_domains[0])
+        apollo_cache.store("org", key, fetched)
+        for domain in key_domains:
+            results[domain] = dict(fetched)
+
+    return results
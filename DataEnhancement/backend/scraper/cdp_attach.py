@@ -0,0 +1,71 @@
+import os
+import json
+import requests
+
+# JSON file describing already-running browsers started with --remote-debugging-port,
+# e.g. {"port": 9222, "user_data_dir": "..."} or a list of such entries (optional "host")
+BROWSER_CDP_REGISTRY = os.getenv("BROWSER_CDP_REGISTRY", "")
+# Seconds to wait for a registered browser's /json/version before treating it as down
+BROWSER_CDP_PROBE_TIMEOUT = float(os.getenv("BROWSER_CDP_PROBE_TIMEOUT", 2))
+CDP_NODE_PREFIX = "cdp://"
+
+
+def load_registry(path=None):
+    """Registry entries as [{"host", "port", "user_data_dir"}]; [] when there is no registry."""
+    path = BROWSER_CDP_REGISTRY if path is None else path
+    if not path or not os.path.exists(path):
+        return []
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Could not read browser registry {path}: {str(e)}")
+        return []
+
+    entries = []
+    for entry in data if isinstance(data, list) else [data]:
+        if isinstance(entry, dict) and entry.get("port"):
+            entries.append({"host": entry.get("host", "127.0.0.1"), "port": int(entry["port"]),
+                            "user_data_dir": entry.get("user_data_dir")})
+    return entries
+
+
+def debugger_address(entry):
+    return f"{entry['host']}:{entry['port']}"
+
+
+def cdp_url(entry):
+    return f"http://{debugger_address(entry)}"
+
+
+def node_for(entry):
+    """Driver pool node name for a registered browser."""
+    return CDP_NODE_PREFIX + debugger_address(entry)
+
+
+def entry_for(node):
+    host, _, port = node[len(CDP_NODE_PREFIX):].rpartition(":")
+    return {"host": host, "port": int(port), "user_data_dir": None}
+
+
+def probe(entry):
+    """The browser's /json/version ({"Browser": "Edg/...", ...}) or None if nothing answers."""
+    try:
+        res = requests.get(f"{cdp_url(entry)}/json/version", timeout=BROWSER_CDP_PROBE_TIMEOUT)
+        res.raise_for_status()
+        return res.json()
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def live_browser(path=None):
+    """First registered browser that answers on its debugging port, with its version info, or None."""
+    for entry in load_registry(path):
+        version = probe(entry)
+        if version:
+            return dict(entry, version=version)
+    return None
+
+
+def is_edge(version):
+    return "Edg" in (version or {}).get("Browser", "") or "Edg/" in (version or {}).get("User-Agent", "")
@@ -0,0 +1,390 @@
+import os
+import time
+import threading
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.edge.options import Options as EdgeOptions
+from selenium.webdriver.edge.service import Service as EdgeService
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+from .cdp_attach import CDP_NODE_PREFIX, load_registry, node_for, entry_for, probe, debugger_address, is_edge
+from .driver_resolver import driver_resolver
+from .resource_blocking import RESOURCE_BLOCKING, apply_blocking, enable_network_log, report_navigation
+
+DRIVER_POOL_SIZE = int(os.getenv("GROWJO_DRIVER_POOL_SIZE", 4))
+# Recycle a browser after this many page navigations to cap memory growth
+DRIVER_MAX_NAVIGATIONS = int(os.getenv("GROWJO_DRIVER_MAX_NAVIGATIONS", 200))
+DRIVER_ACQUIRE_TIMEOUT = int(os.getenv("GROWJO_DRIVER_ACQUIRE_TIMEOUT", 600))
+DRIVER_POOL_PREWARM = os.getenv("GROWJO_DRIVER_POOL_PREWARM", "true").lower() in ("1", "true", "yes")
+# "local" launches Edge next to the API; "remote" opens sessions on Selenium Grid / remote WebDriver URLs;
+# "attach" works in tabs of the running browsers listed in BROWSER_CDP_REGISTRY
+DRIVER_BACKEND = os.getenv("GROWJO_DRIVER_BACKEND", "local").lower()
+# Comma-separated remote WebDriver URLs, each with an optional session capacity,
+# e.g. "http://grid-a:4444=6,http://grid-b:4444" (a local standalone grid works for testing)
+REMOTE_WEBDRIVER_URLS = os.getenv("GROWJO_REMOTE_WEBDRIVER_URLS", "")
+REMOTE_NODE_SESSIONS = int(os.getenv("GROWJO_REMOTE_NODE_SESSIONS", 4))
+REMOTE_BROWSER = os.getenv("GROWJO_REMOTE_BROWSER", "edge").lower()  # "edge" or "chrome"
+# Seconds a node that failed to start a session is skipped while other nodes have room
+NODE_RETRY_AFTER = int(os.getenv("GROWJO_NODE_RETRY_AFTER", 60))
+# Driver sessions (each with its own tab) per attached browser
+ATTACH_SESSIONS = int(os.getenv("GROWJO_ATTACH_SESSIONS", 2))
+LOCAL_NODE = "local"
+
+def driver_path(browser="edge", browser_version=None):
+    """msedgedriver or chromedriver binary, preferring pre-installed ones (see driver_resolver)."""
+    return driver_resolver.resolve(browser, browser_version)
+
+
+def edge_driver_path():
+    return driver_path("edge")
+
+
+def start_driver(browser, options, browser_version=None):
+    """webdriver.Edge / webdriver.Chrome on the resolved driver; a driver that cannot start the browser is dropped."""
+    driver_class, service_class = (webdriver.Edge, EdgeService) if browser == "edge" else (webdriver.Chrome, ChromeService)
+    path = driver_path(browser, browser_version)
+    start = time.monotonic()
+    try:
+        driver = driver_class(service=service_class(path), options=options)
+    except (SessionNotCreatedException, OSError):
+        driver_resolver.invalidate(browser, path)
+        raise
+    except WebDriverException as e:
+        if "unexpectedly exited" in str(e):  # The driver binary itself did not start
+            driver_resolver.invalidate(browser, path)
+        raise
+    driver_resolver.record("launch", time.monotonic() - start)
+    return driver
+
+
+def build_edge_options(headless=True, options_class=EdgeOptions):
+    options = options_class()
+    if headless:
+        options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    if RESOURCE_BLOCKING:
+        enable_network_log(options)
+    return options
+
+
+def launch_edge_driver(headless=True, site="growjo.com"):
+    driver = start_driver("edge", build_edge_options(headless))
+    driver.maximize_window()
+    apply_blocking(driver, site)
+    driver.navigations = 0
+    return driver
+
+
+def launch_remote_driver(url, headless=True, site="growjo.com"):
+    """Open a session on a remote WebDriver / Selenium Grid URL with the same options as local Edge."""
+    if REMOTE_BROWSER == "chrome":
+        options = build_edge_options(headless, ChromeOptions)
+        connection = ChromiumRemoteConnection(url, "goog", "chrome")
+    else:
+        options = build_edge_options(headless)
+        connection = ChromiumRemoteConnection(url, "ms", "MicrosoftEdge")
+    # The Chromium connection exposes the vendor CDP endpoint, so blocking works through the grid
+    driver = webdriver.Remote(command_executor=connection, options=options)
+    driver.set_window_size(1920, 1080)
+    apply_blocking(driver, site)
+    driver.navigations = 0
+    return driver
+
+
+def attach_driver(node, site="growjo.com"):
+    """
+    Attach to a running Chrome/Edge over its debugging port, reusing its profile, cache
+    and logins. The driver works in a tab of its own; quit_driver closes only that tab.
+    """
+    entry = entry_for(node)
+    version = probe(entry)
+    if not version:
+        raise RuntimeError(f"No browser answering on {debugger_address(entry)}")
+    browser = "edge" if is_edge(version) else "chrome"
+    options = EdgeOptions() if browser == "edge" else ChromeOptions()
+    options.debugger_address = debugger_address(entry)
+    # The attached browser reports its own version, so the driver is matched to it
+    driver = start_driver(browser, options, version.get("Browser"))
+    driver.attached = True
+    driver.switch_to.new_window("tab")
+    driver.owned_handle = driver.current_window_handle
+    print(f"[DEBUG] Attached to {version.get('Browser', 'browser')} on {debugger_address(entry)}")
+    apply_blocking(driver, site)
+    driver.navigations = 0
+    return driver
+
+
+def remote_nodes(spec=None, default_sessions=None):
+    """'http://a:4444=6,http://b:4444' -> [("http://a:4444", 6), ("http://b:4444", default_sessions)]"""
+    spec = REMOTE_WEBDRIVER_URLS if spec is None else spec
+    default_sessions = default_sessions or REMOTE_NODE_SESSIONS
+    nodes = []
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        url, _, sessions = entry.rpartition("=")
+        if url and sessions.isdigit():
+            nodes.append((url, int(sessions)))
+        else:
+            nodes.append((entry, default_sessions))
+    return nodes
+
+
+def configured_nodes(size=DRIVER_POOL_SIZE):
+    """(node, capacity) pairs for GROWJO_DRIVER_BACKEND; the local backend is one node of `size`."""
+    if DRIVER_BACKEND == "remote":
+        nodes = remote_nodes()
+        if not nodes:
+            raise ValueError("GROWJO_DRIVER_BACKEND=remote needs GROWJO_REMOTE_WEBDRIVER_URLS")
+        return nodes
+    if DRIVER_BACKEND == "attach":
+        nodes = [(node_for(entry), ATTACH_SESSIONS) for entry in load_registry()]
+        if not nodes:
+            raise ValueError("GROWJO_DRIVER_BACKEND=attach needs a BROWSER_CDP_REGISTRY file")
+        return nodes
+    return [(LOCAL_NODE, size)]
+
+
+def launch_driver(headless=True, node=None, site="growjo.com"):
+    """Start a browser on a node: local Edge, a session on a remote WebDriver URL or a tab in an attached browser."""
+    node = node or configured_nodes()[0][0]
+    if node == LOCAL_NODE:
+        driver = launch_edge_driver(headless, site)
+    elif node.startswith(CDP_NODE_PREFIX):
+        driver = attach_driver(node, site)
+    else:
+        driver = launch_remote_driver(node, headless, site)
+    driver.pool_node = node
+    return driver
+
+
+def note_navigation(driver):
+    driver.navigations = getattr(driver, "navigations", 0) + 1
+
+
+def navigate(driver, url):
+    """driver.get(url), counted towards the driver's recycle budget."""
+    start = time.monotonic()
+    driver.get(url)
+    if not getattr(driver, "navigations", 0):
+        driver_resolver.record("first_navigation", time.monotonic() - start)
+    note_navigation(driver)
+    report_navigation(driver, url)
+
+
+def is_healthy(driver):
+    try:
+        driver.execute_script("return 1;")
+        return bool(driver.window_handles)
+    except Exception:
+        return False
+
+
+def quit_driver(driver):
+    """Quit a driver; an attached browser keeps running and only loses our tab."""
+    try:
+        if getattr(driver, "attached", False):
+            try:
+                driver.switch_to.window(driver.owned_handle)
+                driver.close()
+            finally:
+                driver.service.stop()
+            return
+        driver.quit()
+    except Exception as e:
+        print(f"[ERROR] Quitting driver failed: {str(e)}")
+
+
+class DriverPool:
+    """Process-wide pool of warm browsers that scrapers borrow instead of launching.
+
+    Browsers run on nodes: the local machine, or remote WebDriver / Selenium
+    Grid URLs each with their own session capacity. At most `size` browsers
+    (the summed capacity) exist at once; acquire() blocks until enough are
+    free. New browsers go to the least utilised node that is up. Drivers are
+    health-checked before they are lent out and replaced after a crash or
+    once they reach max_navigations.
+    """
+
+    def __init__(self, size=DRIVER_POOL_SIZE, headless=True, max_navigations=DRIVER_MAX_NAVIGATIONS,
+                 factory=launch_driver, nodes=None):
+        nodes = nodes or configured_nodes(size)
+        self.size = sum(capacity for _, capacity in nodes)
+        self.headless = headless
+        self.max_navigations = max_navigations
+        self._factory = factory
+        self._nodes = {node: {"capacity": capacity, "live": 0, "launched": 0, "launch_failures": 0,
+                              "down_until": 0.0} for node, capacity in nodes}
+        self.remote = any(node != LOCAL_NODE for node in self._nodes)
+        self._idle = []
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {"launched": 0, "launch_failures": 0, "recycled": 0, "unhealthy": 0, "borrowed": 0}
+
+    def _candidate_nodes(self):
+        """Nodes with room, least utilised first; nodes that recently failed only as a last resort."""
+        now = time.time()
+        free = [node for node, info in self._nodes.items() if info["live"] < info["capacity"]]
+        free.sort(key=lambda node: (self._nodes[node]["down_until"] > now,
+                                    self._nodes[node]["live"] / self._nodes[node]["capacity"]))
+        return free
+
+    def _launch(self):
+        with self._cond:
+            candidates = self._candidate_nodes()
+        error = RuntimeError("No driver node has room")
+        for node in candidates:
+            with self._cond:
+                info = self._nodes[node]
+                if info["live"] >= info["capacity"]:
+                    continue
+                info["live"] += 1
+            try:
+                driver = self._factory(self.headless, node)
+            except Exception as e:
+                print(f"[ERROR] Driver launch on node {node} failed: {str(e)}")
+                error = e
+                with self._cond:
+                    info["live"] -= 1
+                    info["launch_failures"] += 1
+                    info["down_until"] = time.time() + NODE_RETRY_AFTER
+                    self._stats["launch_failures"] += 1
+                continue
+            driver.pool_node = node
+            with self._cond:
+                info["launched"] += 1
+                info["down_until"] = 0.0
+                self._stats["launched"] += 1
+            return driver
+        raise error
+
+    def _quit(self, driver):
+        """Quit a driver and free its slot on its node (the pool-wide slot is the caller's)."""
+        quit_driver(driver)
+        with self._cond:
+            info = self._nodes.get(getattr(driver, "pool_node", None))
+            if info:
+                info["live"] -= 1
+
+    def prewarm(self, count=None, background=True):
+        """Launch idle browsers up to `count` (default: the pool size)."""
+        def warm():
+            target = min(count or self.size, self.size)
+            while True:
+                with self._cond:
+                    if self._closed or self._live >= target:
+                        return
+                    self._live += 1
+                try:
+                    driver = self._launch()
+                except Exception as e:
+                    print(f"[ERROR] Driver pool pre-warm failed: {str(e)}")
+                    with self._cond:
+                        self._live -= 1
+                        self._cond.notify_all()
+                    return
+                with self._cond:
+                    self._idle.append(driver)
+                    self._cond.notify_all()
+
+        if background:
+            threading.Thread(target=warm, daemon=True).start()
+        else:
+            warm()
+
+    def acquire(self, count=1, timeout=DRIVER_ACQUIRE_TIMEOUT):
+        """Borrow `count` healthy drivers at once (all-or-nothing, so callers never deadlock)."""
+        if count > self.size:
+            raise ValueError(f"Cannot borrow {count} drivers from a pool of {self.size}")
+
+        deadline = time.time() + timeout
+        with self._cond:
+            while len(self._idle) + (self.size - self._live) < count:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise TimeoutError(f"No free browser in the pool after {timeout}s")
+                self._cond.wait(remaining)
+            borrowed = [self._idle.pop() for _ in range(min(count, len(self._idle)))]
+            to_launch = count - len(borrowed)
+            self._live += to_launch
+            self._stats["borrowed"] += count
+
+        drivers = []
+        try:
+            for driver in borrowed:
+                if is_healthy(driver):
+                    drivers.append(driver)
+                else:
+                    print("[DEBUG] Pooled driver failed health check, replacing it.")
+                    with self._cond:
+                        self._stats["unhealthy"] += 1
+                    self._quit(driver)
+                    to_launch += 1
+            borrowed = []
+            while to_launch:
+                drivers.append(self._launch())
+                to_launch -= 1
+        except Exception:
+            # Give back whatever we hold and the slots we reserved
+            self.release(drivers + borrowed)
+            with self._cond:
+                self._live -= to_launch
+                self._cond.notify_all()
+            raise
+        return drivers
+
+    def release(self, drivers, discard=False):
+        """Return borrowed drivers; crashed or worn-out ones are quit and their slot freed."""
+        for driver in drivers:
+            worn_out = getattr(driver, "navigations", 0) >= self.max_navigations
+            if discard or worn_out or self._closed:
+                if worn_out:
+                    print(f"[DEBUG] Recycling driver after {driver.navigations} navigations.")
+                self._quit(driver)
+                with self._cond:
+                    self._live -= 1
+                    self._stats["recycled"] += 1
+                    self._cond.notify_all()
+            else:
+                with self._cond:
+                    self._idle.append(driver)
+                    self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+            self._cond.notify_all()
+        for driver in idle:
+            self._quit(driver)
+
+    def stats(self):
+        with self._cond:
+            now = time.time()
+            idle_by_node = {}
+            for driver in self._idle:
+                node = getattr(driver, "pool_node", None)
+                idle_by_node[node] = idle_by_node.get(node, 0) + 1
+            nodes = {}
+            for node, info in self._nodes.items():
+                in_use = info["live"] - idle_by_node.get(node, 0)
+                nodes[node] = {
+                    "capacity": info["capacity"], "live": info["live"], "in_use": in_use,
+                    "utilization": round(in_use / info["capacity"], 3) if info["capacity"] else 0.0,
+                    "launched": info["launched"], "launch_failures": info["launch_failures"],
+                    "available": info["down_until"] <= now,
+                }
+            if not self.remote:
+                backend = "local"
+            elif all(node.startswith(CDP_NODE_PREFIX) for node in self._nodes):
+                backend = "attach"
+            else:
+                backend = "remote"
+            return dict(self._stats, backend=backend, size=self.size, live=self._live,
+                        idle=len(self._idle), in_use=self._live - len(self._idle), nodes=nodes)
@@ -0,0 +1,196 @@
+import os
+import re
+import json
+import time
+import shutil
+import subprocess
+import threading
+
+# Never fall back to webdriver_manager (version checks and downloads need the network)
+WEBDRIVER_OFFLINE = os.getenv("WEBDRIVER_OFFLINE", "false").lower() in ("1", "true", "yes")
+WEBDRIVER_CACHE_PATH = os.getenv(
+    "WEBDRIVER_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "webdriver_paths.json")
+)
+
+# Explicit binary per browser, then PATH, then where the Docker image installs them
+DRIVER_ENV = {"edge": "EDGEDRIVER_PATH", "chrome": "CHROMEDRIVER_PATH"}
+DRIVER_BINARIES = {"edge": "msedgedriver", "chrome": "chromedriver"}
+KNOWN_DRIVER_PATHS = {
+    "edge": ["/usr/local/bin/msedgedriver"],
+    "chrome": ["/usr/bin/chromedriver", "/usr/lib/chromium/chromedriver"],
+}
+# Browser binaries whose major version a driver has to match (the Docker image sets CHROME_BIN)
+BROWSER_ENV = {"edge": "EDGE_BIN", "chrome": "CHROME_BIN"}
+BROWSER_BINARIES = {
+    "edge": ["microsoft-edge", "microsoft-edge-stable"],
+    "chrome": ["google-chrome", "chromium", "chromium-browser"],
+}
+STARTUP_PHASES = ("resolve", "launch", "first_navigation")
+
+
+def _is_executable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _driver_version(path):
+    """'ChromeDriver 120.0.6099.71 (...)' / 'Microsoft Edge WebDriver 135.0.3179.85 (...)' -> '120.0.6099.71'.
+
+    Works the same for browsers ('Chromium 120.0.6099.71 built on Debian')."""
+    try:
+        output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r"\d+(\.\d+)+", output or "")
+    return match.group(0) if match else None
+
+
+def _major(version):
+    """'120.0.6099.71' or 'Chrome/120.0.6099.71' -> '120'."""
+    match = re.search(r"(\d+)\.", version or "")
+    return match.group(1) if match else None
+
+
+def _browser_major(browser):
+    """Major version of the installed browser, or None when it cannot be found."""
+    for path in [os.getenv(BROWSER_ENV[browser])] + [shutil.which(name) for name in BROWSER_BINARIES[browser]]:
+        if _is_executable(path):
+            return _major(_driver_version(path))
+    return None
+
+
+class DriverResolver:
+    """Finds msedgedriver / chromedriver without touching the network when it can.
+
+    Pre-installed binaries win over the cache and webdriver_manager. The
+    resolved path and version are kept per process and in WEBDRIVER_CACHE_PATH
+    together with the browser's major version, so later processes skip the
+    download and the `--version` call until the browser is upgraded. Drivers
+    that do not match the browser, or fail to start it, are skipped. Also
+    keeps per-phase browser startup timings (resolve, launch, first navigation).
+    """
+
+    def __init__(self, cache_path=WEBDRIVER_CACHE_PATH, offline=WEBDRIVER_OFFLINE):
+        self.cache_path = cache_path
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._resolved = {}
+        self._failed = set()
+        self._timings = {phase: {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0} for phase in STARTUP_PHASES}
+
+    def _read_disk(self):
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_disk(self, browser, entry):
+        cache = self._read_disk()
+        cache[browser] = entry
+        self._write_cache(cache)
+
+    def _write_cache(self, cache):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            with open(self.cache_path, "w") as f:
+                json.dump(cache, f)
+        except OSError as e:
+            print(f"[DEBUG] Could not write driver cache: {str(e)}")
+
+    def _candidates(self, browser, cached):
+        """(path, source) pairs in preference order; only the network fallback is missing here."""
+        candidates = [(os.getenv(DRIVER_ENV[browser]), "env"), (shutil.which(DRIVER_BINARIES[browser]), "path")]
+        candidates += [(path, "known_path") for path in KNOWN_DRIVER_PATHS[browser]]
+        if cached:
+            candidates.append((cached.get("path"), "disk_cache"))
+        return [(path, source) for path, source in candidates if path not in self._failed]
+
+    def _download(self, browser):
+        if self.offline:
+            raise RuntimeError(f"No {DRIVER_BINARIES[browser]} found and WEBDRIVER_OFFLINE is set")
+        if browser == "edge":
+            from webdriver_manager.microsoft import EdgeChromiumDriverManager as DriverManager
+        else:
+            from webdriver_manager.chrome import ChromeDriverManager as DriverManager
+        return DriverManager().install()
+
+    def resolve(self, browser="edge", browser_version=None):
+        """
+        Path of the driver binary for "edge" or "chrome", resolved once per process.
+        browser_version (e.g. from an attached browser's /json/version) saves looking
+        up the installed browser; a different major version resolves again.
+        """
+        start = time.monotonic()
+        with self._lock:
+            browser_major = _major(browser_version)
+            entry = self._resolved.get(browser)
+            if entry is None or (browser_major and entry["browser_major"] not in (None, browser_major)):
+                entry = self._resolve_uncached(browser, browser_major or _browser_major(browser))
+                self._resolved[browser] = entry
+        self.record("resolve", time.monotonic() - start)
+        return entry["path"]
+
+    def invalidate(self, browser, path=None):
+        """Forget a driver that failed to start the browser, here and on disk; it is skipped from now on."""
+        with self._lock:
+            entry = self._resolved.pop(browser, None)
+            path = path or (entry or {}).get("path")
+            if path:
+                self._failed.add(path)
+            cache = self._read_disk()
+            if browser in cache and cache[browser].get("path") == path:
+                del cache[browser]
+                self._write_cache(cache)
+        print(f"[DEBUG] Dropped {DRIVER_BINARIES[browser]} {path} after it failed to start the browser.")
+
+    def _resolve_uncached(self, browser, browser_major):
+        cached = self._read_disk().get(browser) or {}
+        if browser_major and cached.get("browser_major") not in (None, browser_major):
+            print(f"[DEBUG] Browser is now version {browser_major}, ignoring the cached {DRIVER_BINARIES[browser]}.")
+            cached = {}
+        for path, source in self._candidates(browser, cached):
+            if not _is_executable(path):
+                continue
+            mtime = os.path.getmtime(path)
+            if cached.get("path") == path and cached.get("mtime") == mtime and cached.get("version"):
+                version = cached["version"]  # Same binary as last time, skip --version
+            else:
+                version = _driver_version(path)
+            if browser_major and _major(version) not in (None, browser_major):
+                print(f"[DEBUG] Skipping {path}: driver {version} does not match browser {browser_major}.")
+                continue
+            entry = {"path": path, "version": version, "source": source, "mtime": mtime}
+            break
+        else:
+            path = self._download(browser)
+            entry = {"path": path, "version": _driver_version(path), "source": "webdriver_manager",
+                     "mtime": os.path.getmtime(path)}
+        entry["browser_major"] = browser_major
+
+        print(f"[DEBUG] Using {DRIVER_BINARIES[browser]} {entry['version'] or ''} from {entry['source']}: {entry['path']}")
+        if any(entry[key] != cached.get(key) for key in ("path", "version", "mtime", "browser_major")):
+            self._write_disk(browser, entry)
+        return entry
+
+    def record(self, phase, seconds):
+        with self._lock:
+            timing = self._timings[phase]
+            timing["count"] += 1
+            timing["total_seconds"] += seconds
+            timing["max_seconds"] = max(timing["max_seconds"], seconds)
+
+    def stats(self):
+        with self._lock:
+            timings = {
+                phase: {"count": t["count"], "total_seconds": round(t["total_seconds"], 3),
+                        "avg_seconds": round(t["total_seconds"] / t["count"], 3) if t["count"] else 0.0,
+                        "max_seconds": round(t["max_seconds"], 3)}
+                for phase, t in self._timings.items()
+            }
+            drivers = {browser: {key: entry[key] for key in ("path", "version", "source", "browser_major")}
+                       for browser, entry in self._resolved.items()}
+        return {"offline": self.offline, "drivers": drivers, "startup": timings}
+
+
+driver_resolver = DriverResolver()
@@ -1,79 +1,331 @@
 import os
+import re
 import time
-import difflib
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlparse, parse_qs
+from rapidfuzz import fuzz, process
 from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.edge.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.edge.options import Options as EdgeOptions
-from selenium.webdriver.edge.service import Service as EdgeService
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from .driver_pool import launch_driver, navigate, note_navigation, quit_driver
+from .growjo_session import growjo_session
+from .growjo_http import (
+    fetch_html, fetch_response, parse_search_results, parse_company_page, parse_profile_page, looks_like_email,
+    is_missing_page
+)
+from .growjo_dom import (
+    snapshot_company_page, company_details_from_snapshot, people_from_snapshot, search_rows_from_page,
+    search_state, profile_ready, click_reveals, contacts_revealed
+)
+from .growjo_catalog import growjo_catalog
+from .resource_blocking import apply_blocking
+from .revenueScraper import clean_company_name_variants
+from .waits import GROWJO_WAIT_TIMEOUT, GROWJO_SETTLE_TIMEOUT, RecordedWait, WaitLog, dom_settled
 
 load_dotenv()
 
 GROWJO_LOGIN_URL = "https://growjo.com/login"
 GROWJO_SEARCH_URL = "https://growjo.com/"
+SEARCH_MATCH_THRESHOLD = 0.65
+# How many scored search rows are reported with each result
+SEARCH_SCORES_REPORTED = 5
+# Fetch public company pages over plain HTTP and keep the browser for JS-only pages and reveals
+GROWJO_HTTP_FAST_PATH = os.getenv("GROWJO_HTTP_FAST_PATH", "true").lower() in ("1", "true", "yes")
+# Read employee profiles over HTTP with the saved login cookies before driving the logged-in browser
+GROWJO_HTTP_PROFILES = os.getenv("GROWJO_HTTP_PROFILES", "true").lower() in ("1", "true", "yes")
+# Companies the public stage may run ahead of the logged-in reveal stage in pipelined batches
+GROWJO_PIPELINE_DEPTH = int(os.getenv("GROWJO_PIPELINE_DEPTH", 2))
+# When the first browser search misses, load up to this many query variants at once in
+# tabs of the same browser; 1 keeps the one-query-at-a-time trimming
+GROWJO_SEARCH_TABS = int(os.getenv("GROWJO_SEARCH_TABS", 4))
+# Decision makers revealed per company, best first, stopping at the first real email; 1 reveals only the best
+GROWJO_REVEAL_TOP_K = max(1, int(os.getenv("GROWJO_REVEAL_TOP_K", 1)))
+NOT_FOUND_CONTACTS = {"email": "not found", "phone": "not found", "linkedin": "not found"}
 LOGIN_EMAIL = os.getenv("GROWJO_EMAIL")
 LOGIN_PASSWORD = os.getenv("GROWJO_PASSWORD")
 
+def assign_priority(title):
+    """Assign decision maker priority based on strict title rules."""
+    title = title.lower().replace("&", "and").replace("/", " ")
+    words = title.split()
+    if not words:
+        return 999
+    first_word = words[0]
+    if first_word in ["owner", "founder", "president", "director", "founding"]:
+        return 1
+    elif first_word in ["co-founder", "cofounder"]:
+        return 2
+    elif first_word == "ceo":
+        return 3
+    elif first_word == "chief" and len(words) > 1:
+        second_word = words[1]
+        if second_word in [
+            "executive", "product", "marketing", "financial", "sales",
+            "growth", "operating", "audit", "compliance", "information"
+        ]:
+            return 3
+    return 999
+
+
+def _clean_name(name):
+    return name.replace(",", "").replace(".", "").lower()
+
+
+def score_search_results(intended, results):
+    """Score every search row against the intended name in one pass; best first, scores 0-1."""
+    if not results:
+        return []
+    scored = process.extract(_clean_name(intended), [_clean_name(row["name"]) for row in results],
+                             scorer=fuzz.ratio, limit=None)
+    return [dict(results[idx], score=round(score / 100, 3)) for _, score, idx in scored]
+
+
+def pick_decision_maker(people):
+    """
+    Return the highest-priority person ({name, title, profile_url}) or None.
+    With GROWJO_REVEAL_TOP_K > 1 the next candidates ride along under "alternates".
+    """
+    candidates = [dict(person, priority=assign_priority(person["title"])) for person in people]
+    if candidates:
+        candidates.sort(key=lambda x: x["priority"])
+        best_candidate = candidates[0]
+
+        print(f"[DEBUG] Best candidate selected: {best_candidate['name']} - {best_candidate['title']} (Priority: {best_candidate['priority']})")
+
+        decision_maker = {
+            "name": best_candidate["name"],
+            "title": best_candidate["title"],
+            "profile_url": best_candidate["profile_url"]
+        }
+        alternates = [{key: person[key] for key in ("name", "title", "profile_url")}
+                      for person in candidates[1:GROWJO_REVEAL_TOP_K]]
+        if alternates:
+            decision_maker["alternates"] = alternates
+        return decision_maker
+
+    print("[DEBUG] No decision makers found.")
+    return None
+
+
+def reveal_candidates(decision_maker):
+    """The decision maker followed by its alternates, each as {name, title, profile_url}."""
+    best = {key: value for key, value in decision_maker.items() if key != "alternates"}
+    return [best] + decision_maker.get("alternates", [])
+
+
+def has_contact(details):
+    """True when revealed contacts hold a real email or phone, not masked teasers."""
+    return bool(details) and (looks_like_email(details["email"]) or details["phone"].isdigit())
+
+
+def pick_revealed(candidates, contacts):
+    """
+    (person, contacts) to report from {profile_url: contacts}: the best-ranked candidate
+    with a real email, else the best-ranked with any contact, else the top candidate.
+    """
+    for person in candidates:
+        details = contacts.get(person["profile_url"])
+        if details and looks_like_email(details["email"]):
+            return person, details
+    for person in candidates:
+        details = contacts.get(person["profile_url"])
+        if has_contact(details):
+            return person, details
+    return candidates[0], contacts.get(candidates[0]["profile_url"]) or dict(NOT_FOUND_CONTACTS)
+
+
+def fetch_profiles_http(candidates):
+    """{profile_url: contacts} for every candidate profile readable over HTTP, fetched concurrently."""
+    urls = [person["profile_url"] for person in candidates]
+    with ThreadPoolExecutor(max_workers=len(urls), thread_name_prefix="growjo-profile") as pool:
+        return {url: details for url, details in zip(urls, pool.map(fetch_profile_http, urls)) if details}
+
+
+def search_query_variants(company_name):
+    """Distinct search queries for a name: spelling variants first, then their word-trimmed forms."""
+    name = company_name.strip().lower()
+    variants = [" ".join(variant.split()) for variant in clean_company_name_variants(name)]
+    variants.append(" ".join(re.sub(r"[^\w\s]", " ", name).split()))
+    queries = list(variants)
+    for variant in variants:
+        words = re.sub(r"[^\w\s]", " ", variant).split()
+        queries += [" ".join(words[:n]) for n in range(len(words) - 1, 0, -1)]
+    return list(dict.fromkeys(query for query in queries if query))
+
+
+def search_url(query):
+    return f"{GROWJO_SEARCH_URL}?query={quote(query)}"
+
+
+def is_search_page(url, query):
+    """True when url is the Growjo search page for query (not about:blank or a previous page)."""
+    parsed = urlparse(url or "")
+    return parsed.netloc.endswith("growjo.com") and parse_qs(parsed.query).get("query") == [query]
+
+
+def http_search_company(company_name):
+    """
+    Search over plain HTTP, trying each query variant in turn.
+    Returns (url, searched, scores): (url, True, ...) on a match, (None, True, ...)
+    if nothing matched and (None, False, ...) if the search page needs a browser.
+    """
+    intended = company_name.strip().lower()
+    scores = []
+
+    for query in search_query_variants(company_name):
+        print(f"[DEBUG] HTTP search with query: '{query}'")
+        html = fetch_html(search_url(query))
+        results = parse_search_results(html) if html else None
+        if results is None:
+            print("[DEBUG] Search page not server-rendered, using the browser.")
+            return None, False, scores
+        growjo_catalog.add_results(results)
+
+        scored = score_search_results(intended, results)
+        scores = scored[:SEARCH_SCORES_REPORTED]
+        if scored:
+            best = scored[0]
+            print(f"[DEBUG] Best of {len(scored)} results: '{best['name']}' (score {best['score']:.2f})")
+            if best["score"] >= SEARCH_MATCH_THRESHOLD:
+                return best["url"], True, scores
+
+    print(f"[ERROR] No good match after all trims for '{company_name}'.")
+    return None, True, scores
+
+
+def scrape_public_http(company_name):
+    """
+    Catalog and plain-HTTP part of the public scrape, shared by every engine.
+    Returns {"url", "company_info", "decision_maker", "not_found", "scores"};
+    a browser is needed when decision_maker is None and not_found is False.
+    """
+    public = {"url": None, "company_info": None, "decision_maker": None, "not_found": False, "scores": []}
+
+    # Known companies go straight to their page without any search
+    entry = growjo_catalog.lookup(company_name)
+    if entry:
+        public["url"] = entry["url"]
+    if not GROWJO_HTTP_FAST_PATH:
+        return public
+
+    company_url = public["url"]
+    html = fetch_html(company_url) if company_url else None
+    parsed = parse_company_page(html, company_name) if html else None
+    if company_url and not parsed and (html is None or is_missing_page(html)):
+        growjo_catalog.evict(company_url)  # Stale catalog entry (gone, or "company not found"); search instead
+        company_url = None
+
+    if not company_url:
+        company_url, searched, public["scores"] = http_search_company(company_name)
+        if searched and not company_url:
+            public["not_found"] = True
+            return public
+        html = fetch_html(company_url) if company_url else None
+        parsed = parse_company_page(html, company_name) if html else None
+    public["url"] = company_url
+
+    if parsed:
+        company_info, people = parsed
+        growjo_catalog.add(company_url, metrics=company_info, aliases=[company_name])
+        public["company_info"] = company_info
+        public["decision_maker"] = pick_decision_maker(people)
+    return public
+
+
+def fetch_profile_http(profile_url):
+    """Read a profile's contacts over HTTP using the shared login cookies; None if a browser is needed."""
+    session = growjo_session.http_session()
+    if session is None:
+        return None
+
+    res = fetch_response(profile_url, session)
+    if res is None:
+        return None
+    if "/login" in res.url:
+        print("[DEBUG] HTTP profile fetch bounced to login, dropping the saved session.")
+        growjo_session.invalidate(session.growjo_session_version)
+        return None
+
+    details = parse_profile_page(res.text)
+    if details:
+        print(f"[DEBUG] Profile contacts read over HTTP: {profile_url}")
+    return details
+
+
+def result_from_stages(company_name, company_info, decision_maker, sensitive_info, public_source, search_scores, log):
+    """Final scrape_full_pipeline record, identical for every engine."""
+    return {
+        "company_name": company_info.get("company", company_name),
+        "company_website": company_info.get("website", "not found"),
+        "revenue": company_info.get("revenue", "not found"),
+        "location": ", ".join(filter(None, [company_info.get('city', ''), company_info.get('state', '')])) or "not found",
+        "industry": company_info.get("industry", "not found"),
+        "interests": company_info.get("specialties", "not found"),
+        "employee_count": company_info.get("employees", "not found"),
+        "decider_name": decision_maker.get("name", "not found"),
+        "decider_title": decision_maker.get("title", "not found"),
+        "decider_email": sensitive_info.get("email", "not found"),
+        "decider_phone": sensitive_info.get("phone", "not found"),
+        "decider_linkedin": sensitive_info.get("linkedin", "not found"),
+        "public_source": public_source,
+        "search_scores": search_scores,
+        "waits": log.summary(),
+    }
+
 class GrowjoScraper:
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, pool=None):
         self.headless = headless
+        self.pool = pool  # Optional DriverPool to borrow warm browsers from
         self.driver_public = None  # Public browser (no login)
         self.driver_logged_in = None  # Private browser (with login)
         self.wait1 = None
         self.wait2 = None
         self.logged_in = False
+        self.wait_log = WaitLog()  # Actual time spent waiting, per scraped company
+        self.last_search_scores = []  # Scored rows of the last search that ran
 
         self._setup_browsers()
 
     def _setup_browsers(self):
-        """Initialize two Edge browser instances faster."""
-        options = EdgeOptions()
-        if self.headless:
-            options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--window-size=1920,1080")
-
-        # 🚀 Install only once
-        driver_path = EdgeChromiumDriverManager().install()
-        service = EdgeService(driver_path)
-
-        # 🚀 Launch browsers
-        self.driver_public = webdriver.Edge(service=service, options=options)
-        self.driver_public.maximize_window()
+        """Borrow two browsers from the pool, or launch two on the configured driver backend."""
+        if self.pool:
+            self.driver_public, self.driver_logged_in = self.pool.acquire(2)
+        else:
+            self.driver_public = launch_driver(self.headless)
+            self.driver_logged_in = launch_driver(self.headless)
 
-        self.driver_logged_in = webdriver.Edge(service=service, options=options)
-        self.driver_logged_in.maximize_window()
-
-        self.wait_public = WebDriverWait(self.driver_public, 10)
-        self.wait_logged_in = WebDriverWait(self.driver_logged_in, 10)
+        self.wait_public = RecordedWait(self.driver_public, log=self.wait_log)
+        self.wait_logged_in = RecordedWait(self.driver_logged_in, log=self.wait_log)
 
 
     def login_logged_in_browser(self):
-        """Login into Growjo on the logged-in driver."""
+        """Authenticate the logged-in driver, reusing the process-wide session when possible."""
+        growjo_session.ensure_logged_in(self.driver_logged_in, self._submit_login_form)
+        self.logged_in = True
+
+    def _submit_login_form(self, driver):
+        """Login into Growjo through the login form."""
         print("[DEBUG] Logging into Growjo (logged-in driver)...")
-        self.driver_logged_in.get(GROWJO_LOGIN_URL)
-        time.sleep(3)
+        wait = RecordedWait(driver, log=self.wait_logged_in.log)
+        navigate(driver, GROWJO_LOGIN_URL)
         try:
-            email_field = self.driver_logged_in.find_element(By.ID, "email")
-            password_field = self.driver_logged_in.find_element(By.ID, "password")
+            email_field = wait.until(EC.presence_of_element_located((By.ID, "email")), label="login_form")
+            password_field = driver.find_element(By.ID, "password")
             email_field.clear()
             email_field.send_keys(LOGIN_EMAIL)
             password_field.clear()
             password_field.send_keys(LOGIN_PASSWORD)
-            form = self.driver_logged_in.find_element(By.TAG_NAME, "form")
+            form = driver.find_element(By.TAG_NAME, "form")
             form.submit()
-            time.sleep(5)
-            if "/login" not in self.driver_logged_in.current_url:
+            try:
+                wait.until(lambda d: "/login" not in d.current_url, label="login_redirect")
+            except TimeoutException:
+                pass
+            if "/login" not in driver.current_url:
                 print("[DEBUG] Login successful.")
-                self.logged_in = True
             else:
                 raise Exception("Login failed.")
         except Exception as e:
@@ -82,69 +334,39 @@ class GrowjoScraper:
 
     def search_company(self, driver, wait, company_name):
         """
-        Search for a company on Growjo and click its link if matched.
-        Use similarity score between intended and found company name.
+        Search for a company on Growjo and open the best-scoring result if it matches.
+        Every result row is scored against the intended company name.
         """
         try:
             print(f"\n[DEBUG] Searching for company: '{company_name}'")
 
+            entry = growjo_catalog.lookup(company_name)
+            if entry:
+                print(f"[DEBUG] Catalog hit, opening {entry['url']} directly.")
+                navigate(driver, entry["url"])
+                wait.settle("company_page")
+                if "/company/" in driver.current_url:
+                    return True
+
             intended = company_name.strip().lower()
+            if GROWJO_SEARCH_TABS > 1:
+                return self._search_variants(driver, wait, company_name, intended)
+
             words = intended.split()
 
             while words:
                 query = " ".join(words)
-                print(f"[DEBUG] Trying search with query: '{query}'")
-
-                search_url = f"https://growjo.com/?query={'%20'.join(query.split())}"
-                driver.get(search_url)
-                time.sleep(2)
+                scored = self._search_query(driver, wait, intended, query)
 
-                try:
-                    print("[DEBUG] Waiting for at least one company row to load...")
-                    wait.until(EC.presence_of_element_located(
-                        (By.XPATH, "//table//tbody//tr")
-                    ))
-                    print("[DEBUG] Company table and rows loaded ✅")
-                except TimeoutException:
-                    print(f"[DEBUG] Company table not loaded for '{query}'.")
+                if scored is None:
                     if len(words) <= 1:
                         print(f"[ERROR] Search failed even for single word '{query}'. Stopping.")
                         return False
-                    words.pop()
-                    continue
-
-                company_links = driver.find_elements(
-                    By.XPATH, "//table//tbody//a[starts-with(@href, '/company/')]"
-                )
-
-                if company_links:
-                    link = company_links[0]
-                    href = link.get_attribute("href")
-                    if href and "/company/" in href:
-                        href_company_part = href.split("/company/")[1]
-                        link_full_text = href_company_part.replace("_", " ").lower()
-                    else:
-                        link_full_text = link.text.strip().lower()
-
-                    print(f"[DEBUG] First result (reconstructed): '{link_full_text}'")
-
-                    similarity = self._calculate_similarity(intended, link_full_text)
-                    print(f"[DEBUG] Similarity score: {similarity:.2f}")
-
-                    if similarity >= 0.65:
-                        print(f"[DEBUG] Found good match: '{link_full_text}', clicking...")
-                        driver.execute_script("arguments[0].click();", link)
-                        time.sleep(2)
-
-                        if "/company/" in driver.current_url:
-                            print(f"[DEBUG] Landed on company page: {driver.current_url}")
-                            return True
-                        else:
-                            print(f"[ERROR] After click, not redirected properly.")
-                            return False
-                    else:
-                        print(f"[DEBUG] Similarity too low for '{link_full_text}'. Trimming...")
-
+                elif scored:
+                    best = scored[0]
+                    if best["score"] >= SEARCH_MATCH_THRESHOLD:
+                        return self._open_search_result(driver, wait, company_name, best)
+                    print(f"[DEBUG] No result above threshold for '{query}'. Trimming...")
                 else:
                     print(f"[DEBUG] No company links found for '{query}'.")
 
@@ -162,215 +384,221 @@ class GrowjoScraper:
 
 
 
-    def _calculate_similarity(self, a: str, b: str) -> float:
-        """
-        Helper to calculate similarity between two strings using difflib.
-        Returns a float between 0 and 1.
-        """
-        a_clean = a.replace(",", "").replace(".", "").lower()
-        b_clean = b.replace(",", "").replace(".", "").lower()
-        return difflib.SequenceMatcher(None, a_clean, b_clean).ratio()
+    def _search_query(self, driver, wait, intended, query):
+        """Run one search in the current tab; scored rows, best first, or None if no table loaded."""
+        print(f"[DEBUG] Trying search with query: '{query}'")
+        navigate(driver, search_url(query))
 
-    def extract_company_details(self, driver, company_name):
-        details = {
-            "company": company_name,
-            "city": "",
-            "state": "",
-            "industry": "",
-            "website": "",
-            "employees": "",
-            "revenue": "",
-            "specialties": ""
-        }
         try:
-            # City
-            try:
-                city_elem = driver.find_element(By.XPATH, "//a[contains(@href, '/city/')]")
-                details["city"] = city_elem.text.strip()
-            except:
-                pass
-
-            # State
-            try:
-                state_elem = driver.find_element(By.XPATH, "//a[contains(@href, '/state/')]")
-                details["state"] = state_elem.text.strip()
-            except:
-                pass
-
-            # Industry
-            try:
-                industry_elem = driver.find_element(By.XPATH, "//a[contains(@href, '/industry/')]")
-                details["industry"] = industry_elem.text.strip()
-            except:
-                pass
-
-            # Website
-            try:
-                website_elem = driver.find_element(By.XPATH, "//a[contains(@target, '_blank') and contains(@href, '//') and img]")
-                href = website_elem.get_attribute("href")
-                if href:
-                    details["website"] = href.replace("//", "https://") if href.startswith("//") else href
-            except:
-                pass
-
-            # Revenue
-            try:
-                revenue_section = driver.find_element(By.XPATH, "//h2[contains(text(), 'Estimated Revenue & Valuation')]/following-sibling::ul[1]/li")
-                if revenue_section:
-                    revenue_text = revenue_section.text.strip()
-                    print(f"[DEBUG] Raw revenue section text: {revenue_text}")
-
-                    import re
-                    match = re.search(r"\$[0-9\.]+[BMK]?", revenue_text)
-                    if match:
-                        details["revenue"] = match.group(0)
-            except:
-                pass
-
-            # Employees
-            try:
-                employee_section = driver.find_element(By.XPATH, "//h2[contains(., 'Employee Data')]/following-sibling::ul[1]/li")
-                if employee_section:
-                    employee_text = employee_section.text.strip()
-                    print(f"[DEBUG] Raw employee section text: {employee_text}")
-
-                    import re
-                    match = re.search(r"\b\d+\b", employee_text)
-                    if match:
-                        details["employees"] = match.group(0)
-            except:
-                pass
-
-            # Keywords (Specialties)
-            try:
-                keywords_elem = driver.find_element(By.XPATH, "//strong[contains(text(), 'keywords:')]")
-                parent = keywords_elem.find_element(By.XPATH, "..")
-                parent_text = parent.text
-                if 'keywords:' in parent_text:
-                    details["specialties"] = parent_text.split('keywords:', 1)[1].strip()
-                else:
-                    details["specialties"] = ''
-            except:
-                details["specialties"] = ''
-
-        except Exception as e:
-            print(f"[ERROR] Error extracting company details for {company_name}: {str(e)}")
-
-        return details
-
+            print("[DEBUG] Waiting for at least one company row to load...")
+            wait.until(EC.presence_of_element_located(
+                (By.XPATH, "//table//tbody//tr")
+            ), label="search_results")
+            print("[DEBUG] Company table and rows loaded ✅")
+        except TimeoutException:
+            print(f"[DEBUG] Company table not loaded for '{query}'.")
+            return None
 
-    
-    def find_decision_maker(self, driver, wait, company_name):
+        rows = search_rows_from_page(driver)
+        growjo_catalog.add_results(rows)
+        scored = score_search_results(intended, rows)
+        self.last_search_scores = scored[:SEARCH_SCORES_REPORTED]
+        if scored:
+            print(f"[DEBUG] Best of {len(scored)} results: '{scored[0]['name']}' (score {scored[0]['score']:.2f})")
+        return scored
+
+    def _search_variants(self, driver, wait, company_name, intended):
+        """First query in the current tab; on a miss, the remaining variants in parallel tabs."""
+        queries = search_query_variants(company_name)
+        if not queries:
+            # Blank name: there is no query to search for
+            self.last_search_scores = []
+            print(f"[ERROR] No search query for '{company_name}'.")
+            return False
+        best = self._search_query(driver, wait, intended, queries[0]) or []
+
+        for start in range(1, len(queries), GROWJO_SEARCH_TABS):
+            if best and best[0]["score"] >= SEARCH_MATCH_THRESHOLD:
+                break
+            scored = self._search_in_tabs(driver, wait, intended, queries[start:start + GROWJO_SEARCH_TABS])
+            if scored and (not best or scored[0]["score"] > best[0]["score"]):
+                best = scored
+
+        self.last_search_scores = best[:SEARCH_SCORES_REPORTED]
+        if best and best[0]["score"] >= SEARCH_MATCH_THRESHOLD:
+            return self._open_search_result(driver, wait, company_name, best[0])
+        print(f"[ERROR] No good match in any query variant for '{company_name}'.")
+        return False
+
+    def _search_in_tabs(self, driver, wait, intended, queries):
+        """
+        Load every query in its own tab of the same browser at once and score each tab as
+        its rows appear. Stops at the first tab whose best row clears the threshold and
+        closes all the tabs; returns the best scored rows seen (best first).
+        """
+        home = driver.current_window_handle
+        pending = {}
+        opened = []
+        best = []
         try:
-            print(f"[DEBUG] Looking for decision makers in '{company_name}'...")
-
-            # Step 1: Scroll to bottom to trigger lazy loading
-            print("[DEBUG] Scrolling to trigger lazy loading of employees...")
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
+            for query in queries:
+                driver.switch_to.new_window("tab")
+                opened.append(driver.current_window_handle)
+                if getattr(driver, "resource_site", None):
+                    apply_blocking(driver, driver.resource_site)  # Blocking is set per tab
+                # Assigning location returns at once, so all tabs load concurrently
+                driver.execute_script("window.location.href = arguments[0];", search_url(query))
+                note_navigation(driver)
+                pending[driver.current_window_handle] = query
+            print(f"[DEBUG] Searching {len(pending)} query variants in parallel tabs: {list(pending.values())}")
+
+            def settled(drv):
+                nonlocal best
+                for handle, query in list(pending.items()):
+                    drv.switch_to.window(handle)
+                    try:
+                        url, rows, no_results = search_state(drv)
+                    except WebDriverException:
+                        continue  # Still navigating
+                    # Settled only on its own search page, with rows or Growjo's "no results"
+                    if not is_search_page(url, query) or not (rows or no_results):
+                        continue
+                    del pending[handle]
+                    growjo_catalog.add_results(rows)
+                    scored = score_search_results(intended, rows)
+                    if not scored:
+                        print(f"[DEBUG] No company links found for '{query}'.")
+                        continue
+                    print(f"[DEBUG] Tab '{query}': best of {len(scored)} results "
+                          f"'{scored[0]['name']}' (score {scored[0]['score']:.2f})")
+                    if not best or scored[0]["score"] > best[0]["score"]:
+                        best = scored
+                    if best[0]["score"] >= SEARCH_MATCH_THRESHOLD:
+                        return True
+                return not pending
 
-            # Step 2: Wait until at least 5 rows are present
             try:
-                wait.until(
-                    EC.presence_of_element_located(
-                        (By.XPATH, "//h2[contains(., 'People')]/following::table//tbody/tr[5]")
-                    )
-                )
-                print("[DEBUG] People table and at least 5 rows loaded ✅")
+                wait.until(settled, label="search_tabs")
             except TimeoutException:
-                print(f"[ERROR] People table or enough rows not loaded after scrolling for {company_name}.")
-                return None
-
-            # Step 3: Locate and parse people
-            people_table = driver.find_element(
-                By.XPATH, "//h2[contains(., 'People')]/following::table[1]"
-            )
-            rows = people_table.find_elements(By.TAG_NAME, "tr")[1:]  # Skip header
-            print(f"[DEBUG] Found {len(rows)} people listed.")
-
-            candidates = []
-
-            def assign_priority(title):
-                """Assign decision maker priority based on strict title rules."""
-                title = title.lower().replace("&", "and").replace("/", " ")
-                words = title.split()
-                if not words:
-                    return 999
-                first_word = words[0]
-                if first_word in ["owner", "founder", "president", "director", "founding"]:
-                    return 1
-                elif first_word in ["co-founder", "cofounder"]:
-                    return 2
-                elif first_word == "ceo":
-                    return 3
-                elif first_word == "chief" and len(words) > 1:
-                    second_word = words[1]
-                    if second_word in [
-                        "executive", "product", "marketing", "financial", "sales",
-                        "growth", "operating", "audit", "compliance", "information"
-                    ]:
-                        return 3
-                return 999
-
-            for idx, row in enumerate(rows):
-                cols = row.find_elements(By.TAG_NAME, "td")
-                if len(cols) < 2:
-                    continue
-
-                name_col = cols[0]
-                title_col = cols[1]
-
+                print(f"[DEBUG] No results in time for {list(pending.values())}.")
+            return best
+        finally:
+            # Only our own tabs: an attached browser may have the user's tabs open too
+            for handle in opened:
                 try:
-                    profile_link_elem = name_col.find_element(By.XPATH, ".//a[contains(@href, '/employee/')]")
-                    href = profile_link_elem.get_attribute("href")
-                    name = profile_link_elem.text.strip()
-                    raw_title = title_col.text.strip()
-
-                    if not href or not name:
-                        continue
+                    driver.switch_to.window(handle)
+                    driver.close()
+                except WebDriverException:
+                    pass
+            driver.switch_to.window(home)
+
+    def _open_search_result(self, driver, wait, company_name, best):
+        print(f"[DEBUG] Found good match: '{best['name']}', opening it...")
+        navigate(driver, best["url"])
+        try:
+            wait.until(EC.url_contains("/company/"), label="company_page")
+        except TimeoutException:
+            pass
 
-                    profile_url = "https://growjo.com" + href if href.startswith("/employee/") else href
-                    priority = assign_priority(raw_title)
+        if "/company/" in driver.current_url:
+            print(f"[DEBUG] Landed on company page: {driver.current_url}")
+            growjo_catalog.add(driver.current_url, aliases=[company_name])
+            return True
+        print(f"[ERROR] After opening the result, not redirected properly.")
+        return False
 
-                    candidates.append({
-                        "name": name,
-                        "title": raw_title,
-                        "profile_url": profile_url,
-                        "priority": priority
-                    })
+    def extract_company_details(self, driver, company_name):
+        """Company fields from a single in-page snapshot of the current company page."""
+        return company_details_from_snapshot(snapshot_company_page(driver), company_name)
 
-                    print(f"[DEBUG] Candidate: {name} - {raw_title} (Priority: {priority})")
+    def _load_people(self, driver, wait, company_name):
+        """Scroll to trigger lazy loading and wait for the people table; False if it never fills."""
+        print(f"[DEBUG] Looking for decision makers in '{company_name}'...")
 
-                except Exception as e:
-                    print(f"[ERROR] Could not extract person info: {str(e)}")
-                    continue
+        # Step 1: Scroll to bottom to trigger lazy loading
+        print("[DEBUG] Scrolling to trigger lazy loading of employees...")
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        wait.settle("lazy_load")
 
-            # Step 4: Pick best candidate
-            if candidates:
-                candidates.sort(key=lambda x: x["priority"])
-                best_candidate = candidates[0]
+        # Step 2: Wait until at least 5 rows are present
+        try:
+            wait.until(
+                EC.presence_of_element_located(
+                    (By.XPATH, "//h2[contains(., 'People')]/following::table//tbody/tr[5]")
+                ), label="people_rows"
+            )
+            print("[DEBUG] People table and at least 5 rows loaded ✅")
+            return True
+        except TimeoutException:
+            print(f"[ERROR] People table or enough rows not loaded after scrolling for {company_name}.")
+            return False
 
-                print(f"[DEBUG] Best candidate selected: {best_candidate['name']} - {best_candidate['title']} (Priority: {best_candidate['priority']})")
+    def find_decision_maker(self, driver, wait, company_name):
+        try:
+            if not self._load_people(driver, wait, company_name):
+                return None
 
-                return {
-                    "name": best_candidate["name"],
-                    "title": best_candidate["title"],
-                    "profile_url": best_candidate["profile_url"]
-                }
+            # Step 3: Parse all people rows in one round-trip and pick the best candidate
+            people = people_from_snapshot(snapshot_company_page(driver))
+            print(f"[DEBUG] Found {len(people)} people listed.")
+            return pick_decision_maker(people)
 
-            print("[DEBUG] No decision makers found.")
+        except Exception as e:
+            print(f"[ERROR] Error finding decision maker: {str(e)}")
             return None
 
+    def scrape_company_page(self, driver, wait, company_name):
+        """(company_details, decision_maker) from the current company page with one snapshot."""
+        try:
+            people_loaded = self._load_people(driver, wait, company_name)
         except Exception as e:
             print(f"[ERROR] Error finding decision maker: {str(e)}")
-            return None
+            people_loaded = False
+
+        snapshot = snapshot_company_page(driver)
+        details = company_details_from_snapshot(snapshot, company_name)
+        if not people_loaded:
+            return details, None
+
+        people = people_from_snapshot(snapshot)
+        print(f"[DEBUG] Found {len(people)} people listed.")
+        return details, pick_decision_maker(people)
 
 
+    def _wait_for_profile(self, wait):
+        """Wait until the profile's reveal/contact links render (or we are bounced to login)."""
+        try:
+            wait.until(EC.any_of(
+                EC.presence_of_element_located((By.XPATH, "//button[contains(text(), 'Reveal')] | //a[contains(text(), 'Reveal')]")),
+                EC.presence_of_element_located((By.XPATH, "//a[contains(@href, '/join')]")),
+                EC.url_contains("/login")
+            ), label="profile_page")
+        except TimeoutException:
+            print("[DEBUG] Profile contact section did not appear before timeout.")
+
+    def scrape_profile_http(self, profile_url):
+        """Read a profile's contacts over HTTP using the shared login cookies; None if the browser is needed."""
+        return fetch_profile_http(profile_url)
+
     def scrape_decision_maker_details(self, profile_url, driver):
+        if GROWJO_HTTP_PROFILES:
+            details = self.scrape_profile_http(profile_url)
+            if details:
+                return details
+
         try:
+            wait = RecordedWait(driver, log=self.wait_logged_in.log)
             print(f"[DEBUG] Navigating to decision maker profile: {profile_url}")
-            driver.get(profile_url)
-            time.sleep(3)
+            navigate(driver, profile_url)
+            self._wait_for_profile(wait)
+
+            if "/login" in driver.current_url:
+                # Shared session expired: log in once more and retry the profile
+                print("[DEBUG] Growjo session expired, logging in again.")
+                growjo_session.invalidate(getattr(driver, "growjo_session_version", None))
+                growjo_session.ensure_logged_in(driver, self._submit_login_form)
+                navigate(driver, profile_url)
+                self._wait_for_profile(wait)
 
             # Click reveal buttons
             reveal_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Reveal')] | //a[contains(text(), 'Reveal')]")
@@ -378,9 +606,12 @@ class GrowjoScraper:
                 try:
                     driver.execute_script("arguments[0].click();", btn)
                     print(f"[DEBUG] Clicked a reveal button.")
-                    time.sleep(2)
                 except Exception as e:
                     print(f"[ERROR] Error clicking reveal button: {str(e)}")
+            if reveal_buttons:
+                # Reveals fetch contact data; wait until a real contact replaces the teaser
+                wait.settle("reveal_contacts", contacts_revealed)
+                wait.settle("reveal_render", dom_settled())
 
             # Now start scraping Email and Phone
             email = None
@@ -395,7 +626,7 @@ class GrowjoScraper:
                     text = elem.text.strip()
                     print(f"[DEBUG] join_link text: '{text}'")
 
-                    if '@' in text and '.' in text and not email:
+                    if looks_like_email(text) and not email:
                         email = text
                     elif text.isdigit() and len(text) >= 8 and not phone:
                         phone = text
@@ -432,49 +663,231 @@ class GrowjoScraper:
             }
 
 
-    def scrape_full_pipeline(self, company_name):
-        """Master method to run full scraping pipeline."""
+    def reveal_decision_maker(self, decision_maker, driver):
+        """
+        (person, contacts) for the decision maker. With alternates, every candidate is
+        revealed at once (HTTP first, then tabs of the logged-in browser) and the first
+        real email wins; the top candidate is kept when nobody has one.
+        """
+        candidates = reveal_candidates(decision_maker)
+        if len(candidates) == 1:
+            return candidates[0], self.scrape_decision_maker_details(candidates[0]["profile_url"], driver)
+
+        contacts = fetch_profiles_http(candidates) if GROWJO_HTTP_PROFILES else {}
+        if not any(looks_like_email(details["email"]) for details in contacts.values()):
+            remaining = [person for person in candidates if not has_contact(contacts.get(person["profile_url"]))]
+            if remaining:
+                contacts.update(self._reveal_in_tabs(remaining, driver))
+
+        person, details = pick_revealed(candidates, contacts)
+        if person is not candidates[0]:
+            print(f"[DEBUG] Using alternate decision maker {person['name']} - {person['title']} (first real email revealed).")
+        return person, details
+
+    def _reveal_in_tabs(self, candidates, driver, retry_login=True):
+        """
+        Open every candidate profile in its own tab of the logged-in browser, click its
+        Reveal buttons as soon as they render and read the contacts once they show up.
+        Stops at the first real email; returns {profile_url: contacts} for the tabs read.
+        """
+        wait = RecordedWait(driver, log=self.wait_logged_in.log)
+        home = driver.current_window_handle
+        tabs = {}
+        opened = []
+        contacts = {}
+        expired = False
         try:
-            # Step 1: Public scrape
-            if not self.search_company(self.driver_public, self.wait_public, company_name):
-                return {"error": "Company not found."}
-            
-            company_info = self.extract_company_details(self.driver_public, company_name)
+            for person in candidates:
+                driver.switch_to.new_window("tab")
+                opened.append(driver.current_window_handle)
+                if getattr(driver, "resource_site", None):
+                    apply_blocking(driver, driver.resource_site)
+                driver.execute_script("window.location.href = arguments[0];", person["profile_url"])
+                note_navigation(driver)
+                tabs[driver.current_window_handle] = {"url": person["profile_url"], "clicked_at": None}
+            print(f"[DEBUG] Revealing {len(tabs)} decision makers in parallel tabs.")
+
+            def revealed(drv):
+                nonlocal expired
+                for handle, tab in list(tabs.items()):
+                    drv.switch_to.window(handle)
+                    try:
+                        if "/login" in drv.current_url:
+                            expired = True
+                            return True
+                        if tab["clicked_at"] is None:
+                            if not profile_ready(drv):
+                                continue
+                            tab["clicked_at"] = time.monotonic()
+                            if click_reveals(drv):
+                                print(f"[DEBUG] Clicked reveal buttons on {tab['url']}")
+                                continue  # Let the reveal requests run
+                        elif (not contacts_revealed(drv)
+                              and time.monotonic() - tab["clicked_at"] < GROWJO_SETTLE_TIMEOUT):
+                            continue  # Revealed contacts not rendered yet; read what is there once settle time runs out
+                        details = parse_profile_page(drv.page_source, require_contacts=False)
+                    except WebDriverException:
+                        continue  # Still navigating
+                    del tabs[handle]
+                    contacts[tab["url"]] = details
+                    if looks_like_email(details["email"]):
+                        return True
+                return not tabs
+
+            try:
+                wait.until(revealed, label="reveal_tabs", timeout=GROWJO_WAIT_TIMEOUT + GROWJO_SETTLE_TIMEOUT)
+            except TimeoutException:
+                print(f"[DEBUG] {len(tabs)} profiles did not finish revealing before timeout.")
+        finally:
+            # Only our own tabs: an attached browser may have the user's tabs open too
+            for handle in opened:
+                try:
+                    driver.switch_to.window(handle)
+                    driver.close()
+                except WebDriverException:
+                    pass
+            driver.switch_to.window(home)
+
+        if expired and retry_login:
+            # Shared session expired: log in once more and retry the profiles
+            print("[DEBUG] Growjo session expired, logging in again.")
+            growjo_session.invalidate(getattr(driver, "growjo_session_version", None))
+            growjo_session.ensure_logged_in(driver, self._submit_login_form)
+            return self._reveal_in_tabs(candidates, driver, retry_login=False)
+        return contacts
+
+    def scrape_public(self, company_name):
+        """
+        Collect public company details and the best decision maker.
+        Returns (company_info, decision_maker, source); company_info is None
+        when the company could not be found.
+        """
+        public = scrape_public_http(company_name)
+        self.last_search_scores = public["scores"]
+        if public["not_found"]:
+            return None, None, "http"
+
+        company_url, company_info, decision_maker = public["url"], public["company_info"], public["decision_maker"]
+        if decision_maker:
+            return company_info, decision_maker, "http"
+
+        # Browser fallback: reuse the resolved URL when we have one instead of searching again
+        if company_url:
+            navigate(self.driver_public, company_url)
+            self.wait_public.settle("company_page")
+        elif not self.search_company(self.driver_public, self.wait_public, company_name):
+            return None, None, "browser"
+
+        if company_info is None:
+            company_info, decision_maker = self.scrape_company_page(self.driver_public, self.wait_public, company_name)
+            growjo_catalog.add(self.driver_public.current_url, metrics=company_info, aliases=[company_name])
+        else:
             decision_maker = self.find_decision_maker(self.driver_public, self.wait_public, company_name)
+        return company_info, decision_maker, "http+browser" if company_url else "browser"
+
+    def collect_public(self, company_name, log):
+        """Public stage: everything the public driver (or HTTP) can get, recording waits in log."""
+        self.wait_public.log = log
+        try:
+            company_info, decision_maker, public_source = self.scrape_public(company_name)
+            if company_info is None:
+                return {"error": "Company not found."}
 
             if not decision_maker:
                 return {"error": "No decision maker found."}
 
-            profile_url = decision_maker["profile_url"]
+            return {
+                "company_name": company_name,
+                "company_info": company_info,
+                "decision_maker": decision_maker,
+                "public_source": public_source,
+                "search_scores": self.last_search_scores,
+                "log": log,
+            }
+        except Exception as e:
+            print(f"[ERROR] Public scrape error: {str(e)}")
+            return {"error": str(e)}
+
+    def reveal(self, staged):
+        """Logged-in stage: reveal the decision maker's contacts and build the final result."""
+        if "error" in staged:
+            return staged
 
-            # Step 2: Logged-in scrape
+        company_info = staged["company_info"]
+        decision_maker = staged["decision_maker"]
+        self.wait_logged_in.log = staged["log"]
+        try:
             if not self.logged_in:
                 self.login_logged_in_browser()
 
-            sensitive_info = self.scrape_decision_maker_details(profile_url, self.driver_logged_in)
+            decision_maker, sensitive_info = self.reveal_decision_maker(decision_maker, self.driver_logged_in)
 
-            return {
-                "company_name": company_info.get("company", company_name),
-                "company_website": company_info.get("website", "not found"),
-                "revenue": company_info.get("revenue", "not found"),
-                "location": ", ".join(filter(None, [company_info.get('city', ''), company_info.get('state', '')])) or "not found",
-                "industry": company_info.get("industry", "not found"),
-                "interests": company_info.get("specialties", "not found"),
-                "employee_count": company_info.get("employees", "not found"),
-                "decider_name": decision_maker.get("name", "not found"),
-                "decider_title": decision_maker.get("title", "not found"),
-                "decider_email": sensitive_info.get("email", "not found"),
-                "decider_phone": sensitive_info.get("phone", "not found"),
-                "decider_linkedin": sensitive_info.get("linkedin", "not found"),
-            }
+            return result_from_stages(staged["company_name"], company_info, decision_maker, sensitive_info,
+                                      staged["public_source"], staged["search_scores"], staged["log"])
         except Exception as e:
             print(f"[ERROR] Full pipeline error: {str(e)}")
             return {"error": str(e)}
 
-    def close(self):
-        """Close both browser instances."""
+    def scrape_full_pipeline(self, company_name):
+        """Master method to run full scraping pipeline."""
+        self.wait_log.reset()
+        # Step 1: Public scrape (plain HTTP first, browser only where the page needs JS)
+        staged = self.collect_public(company_name, self.wait_log)
+        # Step 2: Logged-in scrape
+        return self.reveal(staged)
+
+    def scrape_pipelined(self, companies):
+        """
+        Yield (key, result) for an iterator of (key, company_name) pairs.
+        A producer thread runs the public stage for upcoming companies while
+        the logged-in driver reveals the current one, so both browsers stay busy.
+        The iterator is consumed lazily; closing the generator stops the producer.
+        """
+        staged = queue.Queue(maxsize=GROWJO_PIPELINE_DEPTH)
+        stop = threading.Event()
+        done = object()
+
+        def offer(item):
+            while not stop.is_set():
+                try:
+                    staged.put(item, timeout=0.2)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                while not stop.is_set():
+                    try:
+                        key, company_name = next(companies)
+                    except StopIteration:
+                        break
+                    if not offer((key, self.collect_public(company_name, WaitLog()))):
+                        return
+            finally:
+                offer(done)
+
+        companies = iter(companies)
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
         try:
-            self.driver_public.quit()
-            self.driver_logged_in.quit()
-        except Exception as e:
-            print(f"[ERROR] Closing drivers error: {str(e)}")
\ No newline at end of file
+            while True:
+                item = staged.get()
+                if item is done:
+                    return
+                key, stage = item
+                yield key, self.reveal(stage)
+        finally:
+            stop.set()
+            producer.join()
+
+    def close(self, discard=False):
+        """Return both browsers to the pool (or drop them if discard), or quit them."""
+        drivers = [d for d in (self.driver_public, self.driver_logged_in) if d]
+        self.driver_public = self.driver_logged_in = None
+        if self.pool:
+            self.pool.release(drivers, discard=discard)
+        else:
+            for driver in drivers:
+                quit_driver(driver)
\ No newline at end of file
@@ -0,0 +1,167 @@
+import os
+import queue
+import threading
+from .driver_pool import is_healthy
+
+# Fixed worker count; unset means size it from the host's cores and free RAM
+GROWJO_WORKERS = os.getenv("GROWJO_WORKERS")
+# Politeness cap on concurrent browser pairs hitting Growjo
+GROWJO_MAX_WORKERS = int(os.getenv("GROWJO_MAX_WORKERS", 4))
+# Approximate memory needed per worker (one public + one logged-in Edge)
+GROWJO_WORKER_MEMORY_MB = int(os.getenv("GROWJO_WORKER_MEMORY_MB", 1200))
+# How many times a company is retried on a fresh scraper after a browser crash
+GROWJO_CRASH_RETRIES = int(os.getenv("GROWJO_CRASH_RETRIES", 1))
+# "selenium" (Edge browser pairs from the driver pool) or "playwright" (one async browser, many pages)
+GROWJO_ENGINE = os.getenv("GROWJO_ENGINE", "selenium").lower()
+# Overlap each worker's public scrape of the next company with the reveal of the current one
+GROWJO_PIPELINE = os.getenv("GROWJO_PIPELINE", "true").lower() in ("1", "true", "yes")
+
+
+def default_worker_count(local_browsers=True):
+    """Workers the host can sustain: half the cores, bounded by free RAM and the politeness cap.
+
+    With browsers on remote nodes a worker is only a thread here, so just the cap applies.
+    """
+    if GROWJO_WORKERS:
+        return max(1, int(GROWJO_WORKERS))
+    if not local_browsers:
+        return GROWJO_MAX_WORKERS
+
+    by_cpu = max(1, (os.cpu_count() or 1) // 2)
+    try:
+        import psutil
+        by_ram = max(1, int(psutil.virtual_memory().available / (GROWJO_WORKER_MEMORY_MB * 1024 * 1024)))
+    except ImportError:
+        by_ram = by_cpu
+    return max(1, min(by_cpu, by_ram, GROWJO_MAX_WORKERS))
+
+
+def scraper_is_healthy(scraper):
+    if hasattr(scraper, "is_healthy"):
+        return scraper.is_healthy()
+    return all(is_healthy(driver) for driver in (scraper.driver_public, scraper.driver_logged_in))
+
+
+class GrowjoBatchRunner:
+    """Shards a company list across N workers, each driving its own GrowjoScraper.
+
+    Workers pull tasks from a shared queue, so a slow company never stalls
+    the others. A worker whose browsers crash discards its scraper, starts
+    a fresh one, retries the company and puts any other company it had in
+    flight back on the queue.
+    """
+
+    def __init__(self, scraper_factory, workers=None, crash_retries=GROWJO_CRASH_RETRIES):
+        self.scraper_factory = scraper_factory
+        self.workers = workers or default_worker_count()
+        self.crash_retries = crash_retries
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self, tasks, scrape=None, on_start=None, pipeline=None):
+        """Yield (index, result) for each (index, payload) task as soon as a worker finishes it.
+
+        Either scrape(scraper, payload) -> result handles one task at a time, or
+        pipeline(scraper, tasks) consumes an iterator of tasks lazily and yields
+        (index, result), letting the scraper overlap several tasks. Neither
+        should raise.
+        """
+        if pipeline is None:
+            def pipeline(scraper, worker_tasks):
+                for idx, payload in worker_tasks:
+                    yield idx, scrape(scraper, payload)
+
+        tasks = list(tasks)
+        if not tasks:
+            return
+
+        pending = queue.Queue()
+        for task in tasks:
+            pending.put(task)
+        results = queue.Queue()
+        state = {"alive": min(self.workers, len(tasks)), "error": None}
+        attempts = {}
+        lock = threading.Lock()
+
+        def drain():
+            # Nobody is left to scrape: answer every remaining task with the last error
+            error = state["error"] or "Growjo batch stopped before this company was scraped"
+            while True:
+                try:
+                    idx, _ = pending.get_nowait()
+                except queue.Empty:
+                    return
+                results.put((idx, {"error": error}))
+
+        def worker(worker_id):
+            scraper = None
+            in_flight = {}
+
+            def pull():
+                while not self._stop.is_set():
+                    try:
+                        task = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    in_flight[task[0]] = task
+                    if on_start:
+                        on_start(task[0])
+                    yield task
+
+            try:
+                while not self._stop.is_set() and not pending.empty():
+                    if scraper is None:
+                        try:
+                            scraper = self.scraper_factory()
+                        except Exception as e:
+                            print(f"[ERROR] Growjo worker {worker_id} could not start a scraper: {str(e)}")
+                            state["error"] = f"Scraper unavailable: {str(e)}"
+                            return
+
+                    crashed = False
+                    stream = pipeline(scraper, pull())
+                    try:
+                        for idx, result in stream:
+                            task = in_flight.pop(idx)
+                            if isinstance(result, dict) and result.get("error") and not scraper_is_healthy(scraper):
+                                crashed = True
+                                with lock:
+                                    attempts[idx] = attempts.get(idx, 0) + 1
+                                    retry = attempts[idx] <= self.crash_retries
+                                if retry:
+                                    pending.put(task)
+                                else:
+                                    results.put((idx, result))
+                                break
+                            results.put((idx, result))
+                    finally:
+                        stream.close()
+                        # Tasks started but not finished go back for another worker (or this one)
+                        for task in in_flight.values():
+                            pending.put(task)
+                        in_flight.clear()
+
+                    if crashed:
+                        print(f"[ERROR] Growjo worker {worker_id} browser crashed, starting a fresh scraper.")
+                        scraper.close(discard=True)
+                        scraper = None
+            finally:
+                if scraper:
+                    scraper.close()
+                with lock:
+                    state["alive"] -= 1
+                    last = state["alive"] == 0
+                if last:
+                    drain()
+
+        threads = [threading.Thread(target=worker, args=(n,), daemon=True) for n in range(state["alive"])]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for _ in range(len(tasks)):
+                yield results.get()
+        finally:
+            self.stop()
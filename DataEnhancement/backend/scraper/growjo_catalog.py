@@ -0,0 +1,153 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from urllib.parse import unquote
+from rapidfuzz import fuzz, process
+
+GROWJO_CATALOG_ENABLED = os.getenv("GROWJO_CATALOG_ENABLED", "true").lower() in ("1", "true", "yes")
+GROWJO_CATALOG_PATH = os.getenv(
+    "GROWJO_CATALOG_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "growjo_catalog.sqlite3")
+)
+# Minimum fuzzy score (0-100) to go straight to a catalog URL; stricter than the search
+# threshold because a catalog hit skips Growjo's own ranking
+GROWJO_CATALOG_MATCH = float(os.getenv("GROWJO_CATALOG_MATCH", 92))
+
+_SUFFIXES = {"inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co", "company", "plc", "gmbh"}
+METRIC_FIELDS = ("revenue", "employees", "industry", "city", "state", "website")
+
+
+def catalog_key(name):
+    """'Acme Widgets, Inc.' -> 'acme widgets'; case, punctuation and legal suffix insensitive."""
+    if not isinstance(name, str):
+        return None
+    name = name.lower().replace("&", " and ")
+    words = re.sub(r"[^\w\s]", " ", name).split()
+    while len(words) > 1 and words[-1] in _SUFFIXES:
+        words.pop()
+    return " ".join(words) or None
+
+
+def slug_from_url(url):
+    return unquote(url.split("/company/", 1)[1]).strip("/") if url and "/company/" in url else None
+
+
+def name_from_url(url):
+    slug = slug_from_url(url)
+    return slug.replace("_", " ").strip() if slug else None
+
+
+class GrowjoCatalog:
+    """Local catalog of Growjo companies (name, slug, URL, key metrics) with fuzzy lookup.
+
+    Filled from every search result list and company page the scrapers see,
+    so most company names resolve to /company/<slug> without a search.
+    Entries live in SQLite and are mirrored in memory for lookups.
+    """
+
+    def __init__(self, path=GROWJO_CATALOG_PATH, enabled=GROWJO_CATALOG_ENABLED, min_score=GROWJO_CATALOG_MATCH):
+        self.enabled = enabled
+        self.min_score = min_score
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._stats = {"hits": 0, "fuzzy_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._conn = None
+
+        if self.enabled:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS growjo_catalog ("
+                "key TEXT PRIMARY KEY, name TEXT NOT NULL, slug TEXT NOT NULL, url TEXT NOT NULL, "
+                "metrics TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+            for key, name, slug, url, metrics, updated_at in self._conn.execute("SELECT * FROM growjo_catalog"):
+                self._entries[key] = {"name": name, "slug": slug, "url": url,
+                                      "metrics": json.loads(metrics), "updated_at": updated_at}
+
+    def add(self, url, name=None, metrics=None, aliases=()):
+        """
+        Record a company page URL under its Growjo name and any input names that resolved to it.
+        A visited page (metrics given) is only recorded when it yielded at least one metric.
+        """
+        slug = slug_from_url(url)
+        if not self.enabled or not slug:
+            return
+        name = name or name_from_url(url)
+        visited = metrics is not None
+        metrics = {field: metrics[field] for field in METRIC_FIELDS if metrics and metrics.get(field)}
+        if visited and not metrics:
+            return  # Nothing was read from the page (not found, or failed to render)
+        keys = {catalog_key(n) for n in (name, *aliases)} - {None}
+
+        with self._lock:
+            for key in keys:
+                existing = self._entries.get(key)
+                entry = {
+                    "name": name, "slug": slug, "url": url,
+                    # Keep metrics from a visited page when a later search row carries none
+                    "metrics": metrics or (existing["metrics"] if existing and existing["url"] == url else {}),
+                    "updated_at": time.time(),
+                }
+                if existing and existing["url"] == url and existing["metrics"] == entry["metrics"]:
+                    continue
+                self._entries[key] = entry
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO growjo_catalog (key, name, slug, url, metrics, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, name, slug, url, json.dumps(entry["metrics"]), entry["updated_at"])
+                )
+                self._stats["writes"] += 1
+            self._conn.commit()
+
+    def add_results(self, results):
+        """Add search rows shaped like parse_search_results output ([{"name", "url"}])."""
+        for row in results or []:
+            self.add(row["url"], row.get("name"))
+
+    def lookup(self, company_name):
+        """Best catalog entry for a company name (exact key, then fuzzy), or None."""
+        key = catalog_key(company_name)
+        if not self.enabled or not key:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._stats["hits"] += 1
+                return dict(entry)
+
+            match = process.extractOne(key, list(self._entries), scorer=fuzz.ratio, score_cutoff=self.min_score)
+            if match:
+                self._stats["fuzzy_hits"] += 1
+                print(f"[DEBUG] Catalog match for '{company_name}': '{match[0]}' ({match[1]:.0f})")
+                return dict(self._entries[match[0]])
+
+            self._stats["misses"] += 1
+            return None
+
+    def evict(self, url):
+        """Forget every key pointing at a URL that no longer resolves."""
+        if not self.enabled:
+            return
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if entry["url"] == url]
+            for key in keys:
+                del self._entries[key]
+            self._conn.execute("DELETE FROM growjo_catalog WHERE url = ?", (url,))
+            self._conn.commit()
+            self._stats["evictions"] += len(keys)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries), enabled=self.enabled)
+        lookups = stats["hits"] + stats["fuzzy_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["fuzzy_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+
+growjo_catalog = GrowjoCatalog()
@@ -0,0 +1,199 @@
+import re
+
+# Collects every company field and people row of a Growjo company page in one round-trip.
+# XPaths mirror the per-element lookups it replaces; Python keeps the parsing rules.
+_COMPANY_SNAPSHOT_JS = """
+const first = (xpath, root) => document.evaluate(
+    xpath, root || document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const text = (el) => el ? (el.innerText || el.textContent || "").trim() : "";
+
+const website = first("//a[contains(@target, '_blank') and contains(@href, '//') and img]");
+const keywords = first("//strong[contains(text(), 'keywords:')]");
+const table = first("//h2[contains(., 'People')]/following::table[1]");
+
+const people = [];
+if (table) {
+    Array.from(table.querySelectorAll("tr")).slice(1).forEach(row => {
+        const cols = row.querySelectorAll("td");
+        if (cols.length < 2) return;
+        const link = first(".//a[contains(@href, '/employee/')]", cols[0]);
+        if (!link) return;
+        people.push({name: text(link), title: text(cols[1]), href: link.href || link.getAttribute("href") || ""});
+    });
+}
+
+return {
+    city: text(first("//a[contains(@href, '/city/')]")),
+    state: text(first("//a[contains(@href, '/state/')]")),
+    industry: text(first("//a[contains(@href, '/industry/')]")),
+    website: website ? (website.href || website.getAttribute("href") || "") : "",
+    revenue_text: text(first("//h2[contains(text(), 'Estimated Revenue & Valuation')]/following-sibling::ul[1]/li")),
+    employee_text: text(first("//h2[contains(., 'Employee Data')]/following-sibling::ul[1]/li")),
+    keywords_text: keywords && keywords.parentElement ? (keywords.parentElement.innerText || "") : "",
+    people: people
+};
+"""
+
+
+# Every company link of a search results page, in page order
+_SEARCH_ROWS_JS = """
+return Array.from(document.querySelectorAll("table tbody a[href^='/company/']")).map(a => ({
+    href: a.getAttribute("href") || "",
+    url: a.href || "",
+    text: (a.innerText || "").trim()
+}));
+"""
+
+# Growjo's own wording for an empty search (lower-case)
+NO_RESULTS_MARKERS = ["no results", "no companies found", "0 results"]
+
+# Where a search tab is, its company links and whether Growjo says the search is empty
+_SEARCH_STATE_JS = """
+const text = (document.body ? document.body.innerText || "" : "").toLowerCase();
+return {
+    url: location.href,
+    links: Array.from(document.querySelectorAll("table tbody a[href^='/company/']")).map(a => ({
+        href: a.getAttribute("href") || "",
+        url: a.href || "",
+        text: (a.innerText || "").trim()
+    })),
+    no_results: arguments[0].some(marker => text.includes(marker))
+};
+"""
+
+
+# Clicks every Reveal button on an employee profile; returns how many were clicked
+_CLICK_REVEALS_JS = """
+const found = document.evaluate("//button[contains(text(), 'Reveal')] | //a[contains(text(), 'Reveal')]",
+    document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+for (let i = 0; i < found.snapshotLength; i++) found.snapshotItem(i).click();
+return found.snapshotLength;
+"""
+
+# True once a profile shows its Reveal buttons or contact links
+_PROFILE_READY_JS = """
+return !!document.evaluate("//button[contains(text(), 'Reveal')] | //a[contains(text(), 'Reveal')] | //a[contains(@href, '/join')]",
+    document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+"""
+
+
+# True once a profile shows a revealed contact: a mailto:/tel: link, or a /join link whose
+# text is a complete email address (not a masked teaser) or a phone number
+_CONTACTS_REVEALED_JS = """
+const email = /^[\\w.+-]+@[\\w-]+(\\.[\\w-]+)*\\.[a-z]{2,}$/i;
+return Array.from(document.querySelectorAll("a[href*='/join'], a[href^='mailto:'], a[href^='tel:']")).some(a => {
+    const href = a.getAttribute("href") || "";
+    const text = (a.innerText || a.textContent || "").trim();
+    return href.startsWith("mailto:") || href.startsWith("tel:") || email.test(text) || /^\\d{8,}$/.test(text);
+});
+"""
+
+
+def as_page_function(script):
+    """Wrap a WebDriver-style script body (top-level return) for Playwright's page.evaluate."""
+    return "() => {" + script + "}"
+
+
+def search_rows_from_page(driver):
+    """Search result rows as [{"name", "url"}] (same shape as growjo_http.parse_search_results)."""
+    return search_rows_from_links(driver.execute_script(_SEARCH_ROWS_JS))
+
+
+def search_state(driver):
+    """(current url, search rows, no-results marker shown) for the current tab in one round-trip."""
+    state = driver.execute_script(_SEARCH_STATE_JS, NO_RESULTS_MARKERS) or {}
+    return state.get("url", ""), search_rows_from_links(state.get("links")), bool(state.get("no_results"))
+
+
+def search_rows_from_links(links):
+    rows = []
+    for link in links or []:
+        href = link.get("url") or link.get("href")
+        if href and "/company/" in href:
+            name = href.split("/company/")[1].replace("_", " ").lower()
+        else:
+            name = link.get("text", "").lower()
+        rows.append({"name": name, "url": href})
+    return rows
+
+
+def profile_ready(driver):
+    return driver.execute_script(_PROFILE_READY_JS)
+
+
+def contacts_revealed(driver):
+    return driver.execute_script(_CONTACTS_REVEALED_JS)
+
+
+def click_reveals(driver):
+    return driver.execute_script(_CLICK_REVEALS_JS)
+
+
+def snapshot_company_page(driver):
+    """Run the snapshot script on the current page; returns the raw dict or None on failure."""
+    try:
+        return driver.execute_script(_COMPANY_SNAPSHOT_JS)
+    except Exception as e:
+        print(f"[ERROR] Company page snapshot failed: {str(e)}")
+        return None
+
+
+def company_details_from_snapshot(snapshot, company_name):
+    """Same fields and parsing as the original per-element extraction."""
+    snapshot = snapshot or {}
+    details = {
+        "company": company_name,
+        "city": snapshot.get("city", ""),
+        "state": snapshot.get("state", ""),
+        "industry": snapshot.get("industry", ""),
+        "website": "",
+        "employees": "",
+        "revenue": "",
+        "specialties": ""
+    }
+
+    href = snapshot.get("website")
+    if href:
+        details["website"] = href.replace("//", "https://") if href.startswith("//") else href
+
+    revenue_text = snapshot.get("revenue_text", "")
+    if revenue_text:
+        print(f"[DEBUG] Raw revenue section text: {revenue_text}")
+        match = re.search(r"\$[0-9\.]+[BMK]?", revenue_text)
+        if match:
+            details["revenue"] = match.group(0)
+
+    employee_text = snapshot.get("employee_text", "")
+    if employee_text:
+        print(f"[DEBUG] Raw employee section text: {employee_text}")
+        match = re.search(r"\b\d+\b", employee_text)
+        if match:
+            details["employees"] = match.group(0)
+
+    keywords_text = snapshot.get("keywords_text", "")
+    if "keywords:" in keywords_text:
+        details["specialties"] = keywords_text.split("keywords:", 1)[1].strip()
+
+    return details
+
+
+def people_from_snapshot(snapshot):
+    """People rows as [{"name", "title", "profile_url"}], skipping rows without a profile link."""
+    people = []
+    for row in (snapshot or {}).get("people", []):
+        href, name = row.get("href"), row.get("name")
+        if not href or not name:
+            continue
+        people.append({
+            "name": name,
+            "title": row.get("title", ""),
+            "profile_url": "https://growjo.com" + href if href.startswith("/employee/") else href
+        })
+    return people
+
+
+# page.evaluate forms of the snapshot scripts for the Playwright engine
+COMPANY_SNAPSHOT_FN = as_page_function(_COMPANY_SNAPSHOT_JS)
+SEARCH_ROWS_FN = as_page_function(_SEARCH_ROWS_JS)
+CLICK_REVEALS_FN = as_page_function(_CLICK_REVEALS_JS)
+CONTACTS_REVEALED_FN = as_page_function(_CONTACTS_REVEALED_JS)
@@ -0,0 +1,222 @@
+import os
+import re
+import threading
+import requests
+from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+GROWJO_BASE_URL = "https://growjo.com"
+GROWJO_HTTP_POOL_SIZE = int(os.getenv("GROWJO_HTTP_POOL_SIZE", 16))
+GROWJO_HTTP_TIMEOUT = float(os.getenv("GROWJO_HTTP_TIMEOUT", 10))
+EMAIL_PATTERN = re.compile(r"^[\w.+-]+@[\w-]+(\.[\w-]+)*\.[a-z]{2,}$", re.IGNORECASE)
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def new_session():
+    """requests.Session with a pooled, retrying adapter."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=GROWJO_HTTP_POOL_SIZE,
+        pool_maxsize=GROWJO_HTTP_POOL_SIZE,
+        max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def http_session():
+    """Process-wide anonymous session for public pages."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = new_session()
+        return _session
+
+
+def fetch_response(url, session=None):
+    """GET a Growjo page; returns the 200 response (after redirects) or None on any failure."""
+    try:
+        res = (session or http_session()).get(url, timeout=GROWJO_HTTP_TIMEOUT)
+        if res.status_code != 200:
+            print(f"[DEBUG] HTTP {res.status_code} for {url}")
+            return None
+        return res
+    except requests.RequestException as e:
+        print(f"[DEBUG] HTTP fetch failed for {url}: {str(e)}")
+        return None
+
+
+def fetch_html(url, session=None):
+    """GET a Growjo page and return its HTML, or None on any failure."""
+    res = fetch_response(url, session)
+    return res.text if res is not None else None
+
+
+def absolute_url(href):
+    if not href:
+        return ""
+    if href.startswith("//"):
+        return "https:" + href
+    if href.startswith("/"):
+        return GROWJO_BASE_URL + href
+    return href
+
+
+def parse_search_results(html):
+    """Return [{"name", "url"}] for the company rows of a search page.
+
+    Returns None when the page carries no results table at all, i.e. the
+    results are rendered client-side and need a browser.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    tbody = soup.select_one("table tbody")
+    if tbody is None:
+        return None
+
+    results = []
+    for link in tbody.select("a[href^='/company/']"):
+        href = link.get("href", "")
+        slug = href.split("/company/")[1]
+        results.append({
+            "name": slug.replace("_", " ").lower() if slug else link.get_text(strip=True).lower(),
+            "url": absolute_url(href)
+        })
+    return results
+
+
+def _heading(soup, text):
+    return next((h for h in soup.find_all("h2") if text in h.get_text()), None)
+
+
+def _first_li_text(heading):
+    if heading is None:
+        return ""
+    ul = heading.find_next_sibling("ul")
+    li = ul.find("li") if ul else None
+    return li.get_text(" ", strip=True) if li else ""
+
+
+def _is_missing(soup):
+    page_text = soup.get_text(" ").lower()
+    return "page not found" in page_text or "company not found" in page_text
+
+
+def is_missing_page(html):
+    """True for Growjo's own "page/company not found" page, which is served with a 200."""
+    return _is_missing(BeautifulSoup(html, "html.parser"))
+
+
+def parse_company_page(html, company_name):
+    """Parse a public company page into the same fields as GrowjoScraper.extract_company_details.
+
+    Returns (details, people) where people is [{"name", "title", "profile_url"}],
+    or None if the page is missing or its content is rendered by JavaScript.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    if _is_missing(soup):
+        return None
+
+    revenue_heading = _heading(soup, "Estimated Revenue & Valuation")
+    if revenue_heading is None and not soup.select_one("a[href*='/industry/']"):
+        return None  # Shell page: content is rendered client-side
+
+    details = {
+        "company": company_name,
+        "city": "",
+        "state": "",
+        "industry": "",
+        "website": "",
+        "employees": "",
+        "revenue": "",
+        "specialties": ""
+    }
+
+    for field, fragment in (("city", "/city/"), ("state", "/state/"), ("industry", "/industry/")):
+        elem = soup.select_one(f"a[href*='{fragment}']")
+        if elem:
+            details[field] = elem.get_text(strip=True)
+
+    for link in soup.select("a[target='_blank'][href*='//']"):
+        if link.find("img"):
+            details["website"] = absolute_url(link["href"])
+            break
+
+    match = re.search(r"\$[0-9\.]+[BMK]?", _first_li_text(revenue_heading))
+    if match:
+        details["revenue"] = match.group(0)
+
+    match = re.search(r"\b\d+\b", _first_li_text(_heading(soup, "Employee Data")))
+    if match:
+        details["employees"] = match.group(0)
+
+    keywords_elem = next((s for s in soup.find_all("strong") if "keywords:" in s.get_text()), None)
+    if keywords_elem and keywords_elem.parent:
+        parent_text = keywords_elem.parent.get_text()
+        if "keywords:" in parent_text:
+            details["specialties"] = parent_text.split("keywords:", 1)[1].strip()
+
+    people = []
+    people_heading = _heading(soup, "People")
+    people_table = people_heading.find_next("table") if people_heading else None
+    if people_table:
+        for row in people_table.find_all("tr")[1:]:  # Skip header
+            cols = row.find_all("td")
+            if len(cols) < 2:
+                continue
+            link = cols[0].select_one("a[href*='/employee/']")
+            if not link or not link.get("href") or not link.get_text(strip=True):
+                continue
+            people.append({
+                "name": link.get_text(strip=True),
+                "title": cols[1].get_text(strip=True),
+                "profile_url": absolute_url(link["href"])
+            })
+
+    return details, people
+
+
+def looks_like_email(value):
+    """A complete address, not a masked teaser or placeholder."""
+    return bool(value) and bool(EMAIL_PATTERN.match(value.strip()))
+
+
+def parse_profile_page(html, require_contacts=True):
+    """Parse email, phone and LinkedIn from an employee profile page (lxml).
+
+    Contacts are read from the /join links exactly like the browser path, plus
+    any mailto:/tel: links; masked teasers do not count as an email. With
+    require_contacts, returns None when nothing usable can be read without a
+    browser: the page is a JS shell, or its contacts are still behind Reveal buttons.
+    """
+    tree = lxml_html.fromstring(html)
+    email = phone = None
+    for link in tree.xpath("//a[contains(@href, '/join') or starts-with(@href, 'mailto:') or starts-with(@href, 'tel:')]"):
+        href = link.get("href", "")
+        text = link.text_content().strip()
+        if href.startswith("mailto:"):
+            text = href[len("mailto:"):].split("?")[0]
+        elif href.startswith("tel:"):
+            text = re.sub(r"\D", "", href)
+        if looks_like_email(text) and not email:
+            email = text
+        elif text.isdigit() and len(text) >= 8 and not phone:
+            phone = text
+
+    if require_contacts and not (email or phone):
+        return None
+
+    linkedin = tree.xpath("//a[contains(@href, 'linkedin.com')]/@href")
+    return {
+        "email": email or "not found",
+        "phone": phone or "not found",
+        "linkedin": absolute_url(linkedin[0]) if linkedin else "not found",
+    }
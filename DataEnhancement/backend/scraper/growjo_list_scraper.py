@@ -2,9 +2,11 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from urllib.parse import unquote
 import time
+from .driver_resolver import driver_resolver
+from .growjo_catalog import growjo_catalog
+from .resource_blocking import RESOURCE_BLOCKING, apply_blocking, enable_network_log, report_navigation
 
 def get_growjo_company_list(search_term):
     options = Options()
@@ -12,14 +14,22 @@ def get_growjo_company_list(search_term):
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
     options.add_argument("--window-size=1920x1080")
+    if RESOURCE_BLOCKING:
+        enable_network_log(options)
 
-    service = Service(ChromeDriverManager().install())
+    service = Service(driver_resolver.resolve("chrome"))
+    start = time.monotonic()
     driver = webdriver.Chrome(service=service, options=options)
+    driver_resolver.record("launch", time.monotonic() - start)
+    apply_blocking(driver, "growjo.com")
 
     try:
         search_url = f"https://growjo.com/?query={search_term.replace(' ', '%20')}"
+        start = time.monotonic()
         driver.get(search_url)
+        driver_resolver.record("first_navigation", time.monotonic() - start)
         time.sleep(3)  # Let it render
+        report_navigation(driver, search_url)
 
         rows = driver.find_elements(By.CSS_SELECTOR, "table.jss31 tbody tr")
         results = []
@@ -32,6 +42,7 @@ def get_growjo_company_list(search_term):
                     slug = href.split("/company/")[-1]
                     name = unquote(slug.replace("_", " ")).strip()
                     results.append(name)
+                    growjo_catalog.add(href, name)
             except:
                 continue
 
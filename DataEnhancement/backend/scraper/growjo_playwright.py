@@ -0,0 +1,433 @@
+import os
+import re
+import time
+import asyncio
+import threading
+from urllib.parse import quote
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from .growjoScraper import (
+    GROWJO_LOGIN_URL, GROWJO_SEARCH_URL, GROWJO_HTTP_PROFILES, SEARCH_MATCH_THRESHOLD, SEARCH_SCORES_REPORTED,
+    LOGIN_EMAIL, LOGIN_PASSWORD, scrape_public_http, fetch_profile_http, score_search_results,
+    pick_decision_maker, result_from_stages, reveal_candidates, looks_like_email, pick_revealed
+)
+from .growjo_dom import CLICK_REVEALS_FN, CONTACTS_REVEALED_FN, COMPANY_SNAPSHOT_FN, SEARCH_ROWS_FN, company_details_from_snapshot, people_from_snapshot, search_rows_from_links
+from .growjo_http import parse_profile_page
+from .growjo_catalog import growjo_catalog
+from .growjo_session import growjo_session, GROWJO_BASE_URL
+from .cdp_attach import live_browser, cdp_url
+from .driver_pool import DRIVER_BACKEND
+from .resource_blocking import RESOURCE_BLOCKING, playwright_route_handler
+from .waits import GROWJO_WAIT_TIMEOUT, GROWJO_SETTLE_TIMEOUT, WaitLog
+
+# Pages scraped at once inside the single shared browser
+GROWJO_PLAYWRIGHT_PAGES = int(os.getenv("GROWJO_PLAYWRIGHT_PAGES", 8))
+# Browser binary: an explicit path (the Docker image ships Chromium at CHROME_BIN) or a channel such as "msedge"
+GROWJO_PLAYWRIGHT_EXECUTABLE = os.getenv("GROWJO_PLAYWRIGHT_EXECUTABLE") or os.getenv("CHROME_BIN")
+GROWJO_PLAYWRIGHT_CHANNEL = os.getenv("GROWJO_PLAYWRIGHT_CHANNEL")
+
+WAIT_MS = int(GROWJO_WAIT_TIMEOUT * 1000)
+SETTLE_MS = int(GROWJO_SETTLE_TIMEOUT * 1000)
+PEOPLE_ROWS_XPATH = "xpath=//h2[contains(., 'People')]/following::table//tbody/tr[5]"
+PROFILE_READY_XPATH = "xpath=//button[contains(text(), 'Reveal')] | //a[contains(text(), 'Reveal')] | //a[contains(@href, '/join')]"
+WRITE_LOCAL_STORAGE_FN = "saved => { for (const [key, value] of Object.entries(saved)) localStorage.setItem(key, value); }"
+
+
+def selenium_cookie(cookie):
+    """Playwright cookie -> the Selenium format growjo_session stores."""
+    converted = {k: v for k, v in cookie.items() if k != "expires"}
+    if cookie.get("expires", -1) > 0:
+        converted["expiry"] = int(cookie["expires"])
+    return converted
+
+
+class PlaywrightManager:
+    """Async Playwright browser for Growjo, modelled on phase_1's PlaywrightManager.
+
+    One browser holds a public context and a logged-in context; every
+    company gets its own short-lived pages in them. With attach, the browser
+    is a running one from BROWSER_CDP_REGISTRY: both roles share its default
+    context (profile, cache and logins) and only our own pages are closed.
+    """
+
+    def __init__(self, headless: bool = True, attach: bool = DRIVER_BACKEND == "attach"):
+        self.headless = headless
+        self.attach = attach
+        self.attached = False
+        self.playwright = None
+        self.browser = None
+        self.public_context = None
+        self.logged_in_context = None
+
+    async def start_browser(self):
+        """Initialize the Playwright session, the browser and both contexts."""
+        self.playwright = await async_playwright().start()
+        entry = live_browser() if self.attach else None
+        if entry:
+            self.browser = await self.playwright.chromium.connect_over_cdp(cdp_url(entry))
+            self.attached = True
+            print(f"[DEBUG] Attached to {entry['version'].get('Browser', 'browser')} on {cdp_url(entry)}")
+            context = self.browser.contexts[0] if self.browser.contexts else await self.browser.new_context()
+            context.set_default_timeout(WAIT_MS)
+            self.public_context = self.logged_in_context = context
+            return
+        if self.attach:
+            print("[DEBUG] No registered browser is answering, launching one instead.")
+
+        launch_args = {"headless": self.headless, "args": ["--no-sandbox", "--disable-dev-shm-usage"]}
+        if GROWJO_PLAYWRIGHT_EXECUTABLE:
+            launch_args["executable_path"] = GROWJO_PLAYWRIGHT_EXECUTABLE
+        elif GROWJO_PLAYWRIGHT_CHANNEL:
+            launch_args["channel"] = GROWJO_PLAYWRIGHT_CHANNEL
+        self.browser = await self.playwright.chromium.launch(**launch_args)
+        self.public_context = await self.new_context()
+        self.logged_in_context = await self.new_context()
+
+    async def new_context(self):
+        context = await self.browser.new_context(viewport={"width": 1920, "height": 1080})
+        context.set_default_timeout(WAIT_MS)
+        if RESOURCE_BLOCKING:
+            await context.route("**/*", playwright_route_handler("growjo.com"))
+        return context
+
+    async def new_page(self, context):
+        """A page in context; attached browsers get blocking per page so the user's tabs are untouched."""
+        page = await context.new_page()
+        if self.attached and RESOURCE_BLOCKING:
+            await page.route("**/*", playwright_route_handler("growjo.com"))
+        return page
+
+    async def load_session(self):
+        """
+        Put the saved Growjo session into the logged-in context. A launched browser gets a
+        fresh context with the localStorage init script installed once (pages still open in
+        the old context finish first); an attached browser's shared context keeps the user's
+        other logins, so its Growjo cookies are swapped and localStorage written in place.
+        """
+        cookies = growjo_session.playwright_cookies()
+        if self.attached:
+            context = self.logged_in_context
+            await context.clear_cookies(domain=re.compile(r"growjo\.com$"))
+            await context.add_cookies(cookies)
+            page = await self.new_page(context)
+            try:
+                await page.goto(GROWJO_BASE_URL)
+                await page.evaluate(WRITE_LOCAL_STORAGE_FN, growjo_session.local_storage())
+            finally:
+                await page.close()
+            return
+
+        context = await self.new_context()
+        await context.add_cookies(cookies)
+        await context.add_init_script(growjo_session.local_storage_script())
+        old, self.logged_in_context = self.logged_in_context, context
+        if old:
+            asyncio.ensure_future(self._close_when_idle(old))
+
+    @staticmethod
+    async def _close_when_idle(context, poll=1.0):
+        while context.pages:
+            await asyncio.sleep(poll)
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    def is_connected(self):
+        return bool(self.browser and self.browser.is_connected())
+
+    async def stop_browser(self):
+        """Close both contexts, the browser and the Playwright session (an attached browser is only disconnected)."""
+        if not self.attached:
+            for context in (self.public_context, self.logged_in_context):
+                if context:
+                    try:
+                        await context.close()
+                    except Exception:
+                        pass
+        self.public_context = self.logged_in_context = None
+        if self.browser:
+            try:
+                await self.browser.close()
+            except Exception:
+                pass
+            self.browser = None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+        self.attached = False
+
+
+class AsyncGrowjoScraper:
+    """Growjo pipeline on async Playwright: many companies at once in one browser and one event loop.
+
+    Same output as GrowjoScraper.scrape_full_pipeline; the HTTP fast paths,
+    catalog, matcher and session store are shared with the Selenium engine.
+    """
+
+    def __init__(self, headless=True, max_pages=GROWJO_PLAYWRIGHT_PAGES):
+        self.manager = PlaywrightManager(headless)
+        self._pages = asyncio.Semaphore(max_pages)
+        self._login_lock = asyncio.Lock()
+        self._session_version = None  # growjo_session version loaded into the logged-in context
+
+    async def start(self):
+        await self.manager.start_browser()
+
+    async def _wait(self, log, label, awaitable):
+        """Await a Playwright wait, recording its duration; False instead of raising on timeout."""
+        start = time.monotonic()
+        satisfied = False
+        try:
+            await awaitable
+            satisfied = True
+        except PlaywrightTimeoutError:
+            pass
+        finally:
+            log.record(label, time.monotonic() - start, satisfied)
+        return satisfied
+
+    async def _search_company(self, page, company_name, log):
+        """Browser search with the same trim-and-score rules; returns (url, scores)."""
+        intended = company_name.strip().lower()
+        words = intended.split()
+        scores = []
+
+        while words:
+            query = " ".join(words)
+            print(f"[DEBUG] Trying search with query: '{query}'")
+            await page.goto(f"{GROWJO_SEARCH_URL}?query={quote(query)}")
+            if await self._wait(log, "search_results", page.wait_for_selector("table tbody tr")):
+                rows = search_rows_from_links(await page.evaluate(SEARCH_ROWS_FN))
+                growjo_catalog.add_results(rows)
+                scored = score_search_results(intended, rows)
+                scores = scored[:SEARCH_SCORES_REPORTED]
+                if scored and scored[0]["score"] >= SEARCH_MATCH_THRESHOLD:
+                    print(f"[DEBUG] Found good match: '{scored[0]['name']}' (score {scored[0]['score']:.2f})")
+                    return scored[0]["url"], scores
+            words.pop()
+
+        print(f"[ERROR] No good match after all trims for '{company_name}'.")
+        return None, scores
+
+    async def _scrape_company_page(self, page, company_name, log):
+        """(company_details, decision_maker) from the open company page with one snapshot."""
+        await page.evaluate("() => window.scrollTo(0, document.body.scrollHeight)")
+        await self._wait(log, "lazy_load", page.wait_for_load_state("networkidle", timeout=SETTLE_MS))
+        people_loaded = await self._wait(log, "people_rows", page.wait_for_selector(PEOPLE_ROWS_XPATH))
+
+        snapshot = await page.evaluate(COMPANY_SNAPSHOT_FN)
+        details = company_details_from_snapshot(snapshot, company_name)
+        if not people_loaded:
+            print(f"[ERROR] People table or enough rows not loaded after scrolling for {company_name}.")
+            return details, None
+        return details, pick_decision_maker(people_from_snapshot(snapshot))
+
+    async def _scrape_public(self, company_name, log):
+        """Returns (company_info, decision_maker, source, search_scores)."""
+        public = await asyncio.to_thread(scrape_public_http, company_name)
+        if public["not_found"]:
+            return None, None, "http", public["scores"]
+        company_url, company_info, decision_maker = public["url"], public["company_info"], public["decision_maker"]
+        if decision_maker:
+            return company_info, decision_maker, "http", public["scores"]
+
+        page = await self.manager.new_page(self.manager.public_context)
+        try:
+            scores = public["scores"]
+            target = company_url
+            if not target:
+                target, scores = await self._search_company(page, company_name, log)
+                if not target:
+                    return None, None, "browser", scores
+            await page.goto(target)
+            await self._wait(log, "company_page", page.wait_for_load_state("networkidle", timeout=SETTLE_MS))
+
+            page_info, decision_maker = await self._scrape_company_page(page, company_name, log)
+            if company_info is None:
+                company_info = page_info
+                growjo_catalog.add(page.url, metrics=company_info, aliases=[company_name])
+            return company_info, decision_maker, "http+browser" if company_url else "browser", scores
+        finally:
+            await page.close()
+
+    async def _login(self):
+        """Log in through the form in the logged-in context and save the session for every engine."""
+        print("[DEBUG] Logging into Growjo (Playwright)...")
+        page = await self.manager.new_page(self.manager.logged_in_context)
+        try:
+            await page.goto(GROWJO_LOGIN_URL)
+            await page.fill("#email", LOGIN_EMAIL or "")
+            await page.fill("#password", LOGIN_PASSWORD or "")
+            await page.evaluate("() => document.querySelector('form').submit()")
+            try:
+                await page.wait_for_url(lambda url: "/login" not in url)
+            except PlaywrightTimeoutError:
+                pass
+            if "/login" in page.url:
+                raise Exception("Login failed.")
+            print("[DEBUG] Login successful.")
+
+            cookies = [selenium_cookie(c) for c in await self.manager.logged_in_context.cookies()]
+            local_storage = await page.evaluate("() => Object.assign({}, window.localStorage)")
+            growjo_session.save_state(cookies, local_storage)
+        finally:
+            await page.close()
+
+    async def _ensure_logged_in(self):
+        async with self._login_lock:
+            if growjo_session.is_valid() and self._session_version == growjo_session.version:
+                return
+            if not growjo_session.is_valid():
+                await self._login()
+            await self.manager.load_session()
+            self._session_version = growjo_session.version
+
+    async def _open_profile(self, page, profile_url, log):
+        await page.goto(profile_url)
+        await self._wait(log, "profile_page", page.wait_for_selector(PROFILE_READY_XPATH))
+
+    async def _reveal(self, profile_url, log):
+        """Email, phone and LinkedIn for a profile: HTTP with the shared cookies first, then the browser."""
+        if GROWJO_HTTP_PROFILES:
+            details = await asyncio.to_thread(fetch_profile_http, profile_url)
+            if details:
+                return details
+
+        await self._ensure_logged_in()
+        page = await self.manager.new_page(self.manager.logged_in_context)
+        try:
+            await self._open_profile(page, profile_url, log)
+            if "/login" in page.url:
+                print("[DEBUG] Growjo session expired, logging in again.")
+                growjo_session.invalidate(self._session_version)
+                await self._ensure_logged_in()
+                await self._open_profile(page, profile_url, log)
+
+            if await page.evaluate(CLICK_REVEALS_FN):
+                # Reveals fetch contact data; wait until a real contact replaces the teaser
+                await self._wait(log, "reveal_contacts", page.wait_for_function(CONTACTS_REVEALED_FN, timeout=SETTLE_MS))
+            return parse_profile_page(await page.content(), require_contacts=False)
+        finally:
+            await page.close()
+
+    async def _reveal_decision_maker(self, decision_maker, log):
+        """(person, contacts): every candidate revealed on its own page at once, first real email wins."""
+        candidates = reveal_candidates(decision_maker)
+        if len(candidates) == 1:
+            return candidates[0], await self._reveal(candidates[0]["profile_url"], log)
+
+        tasks = {asyncio.ensure_future(self._reveal(person["profile_url"], log)): person for person in candidates}
+        contacts = {}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception():
+                        print(f"[ERROR] Reveal failed for {tasks[task]['profile_url']}: {task.exception()}")
+                        continue
+                    contacts[tasks[task]["profile_url"]] = task.result()
+                if any(looks_like_email(details["email"]) for details in contacts.values()):
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+        return pick_revealed(candidates, contacts)
+
+    async def scrape_full_pipeline(self, company_name):
+        """Master method to run full scraping pipeline."""
+        log = WaitLog()
+        async with self._pages:
+            try:
+                company_info, decision_maker, public_source, scores = await self._scrape_public(company_name, log)
+                if company_info is None:
+                    return {"error": "Company not found."}
+                if not decision_maker:
+                    return {"error": "No decision maker found."}
+
+                decision_maker, sensitive_info = await self._reveal_decision_maker(decision_maker, log)
+                return result_from_stages(company_name, company_info, decision_maker, sensitive_info,
+                                          public_source, scores, log)
+            except Exception as e:
+                print(f"[ERROR] Full pipeline error: {str(e)}")
+                return {"error": str(e)}
+
+    async def close(self):
+        await self.manager.stop_browser()
+
+
+class PlaywrightGrowjoEngine:
+    """Runs one AsyncGrowjoScraper on a background event loop for synchronous callers."""
+
+    def __init__(self, headless=True):
+        self.headless = headless
+        self._lock = threading.Lock()
+        self._loop = None
+        self._scraper = None
+        self._stats = {"starts": 0, "restarts": 0}
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def start(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, daemon=True, name="growjo-playwright").start()
+            if self._scraper is None:
+                scraper = AsyncGrowjoScraper(self.headless)
+                self._run(scraper.start())
+                self._scraper = scraper
+                self._stats["starts"] += 1
+
+    def scrape_full_pipeline(self, company_name):
+        self.start()
+        return self._run(self._scraper.scrape_full_pipeline(company_name))
+
+    def is_healthy(self):
+        scraper = self._scraper
+        return bool(scraper and scraper.manager.is_connected())
+
+    def restart(self):
+        """Drop a crashed browser; the next scrape launches a new one."""
+        with self._lock:
+            if self._scraper is None or self._scraper.manager.is_connected():
+                return
+            scraper, self._scraper = self._scraper, None
+            self._stats["restarts"] += 1
+        try:
+            self._run(scraper.close())
+        except Exception as e:
+            print(f"[ERROR] Closing crashed Playwright browser failed: {str(e)}")
+
+    def close(self):
+        with self._lock:
+            scraper, self._scraper = self._scraper, None
+        if scraper:
+            self._run(scraper.close())
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, running=self._scraper is not None, max_pages=GROWJO_PLAYWRIGHT_PAGES)
+
+
+playwright_engine = PlaywrightGrowjoEngine()
+
+
+class GrowjoPlaywrightScraper:
+    """GrowjoScraper-compatible handle (scrape_full_pipeline / close) on the shared Playwright engine."""
+
+    def __init__(self, headless=True, engine=None):
+        self.engine = engine or playwright_engine
+        self.engine.start()
+
+    def scrape_full_pipeline(self, company_name):
+        return self.engine.scrape_full_pipeline(company_name)
+
+    def is_healthy(self):
+        return self.engine.is_healthy()
+
+    def close(self, discard=False):
+        # The browser is shared and stays warm; only a crashed one is replaced
+        if discard:
+            self.engine.restart()
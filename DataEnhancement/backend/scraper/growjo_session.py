@@ -0,0 +1,219 @@
+import os
+import re
+import json
+import time
+import threading
+from .growjo_http import new_session
+
+GROWJO_BASE_URL = "https://growjo.com/"
+GROWJO_SESSION_PATH = os.getenv(
+    "GROWJO_SESSION_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "growjo_session.json")
+)
+# Force a fresh login after this long even if the cookies claim to be valid
+GROWJO_SESSION_MAX_AGE = int(os.getenv("GROWJO_SESSION_MAX_AGE", 12 * 3600))
+# Comma-separated names of the cookies that carry the login; by default any session/auth/token-looking
+# cookie. Analytics cookies (_ga, _gid, ...) expiring must not force a fresh login.
+GROWJO_AUTH_COOKIES = [name.strip() for name in os.getenv("GROWJO_AUTH_COOKIES", "").split(",") if name.strip()]
+AUTH_COOKIE_PATTERN = re.compile(r"sess|sid|auth|token|jwt|login", re.IGNORECASE)
+
+# Restores saved localStorage on Growjo pages without an extra navigation
+_LOCAL_STORAGE_SCRIPT = """
+if (location.hostname.endsWith('growjo.com')) {
+    const saved = %s;
+    for (const [key, value] of Object.entries(saved)) {
+        if (localStorage.getItem(key) === null) localStorage.setItem(key, value);
+    }
+}
+"""
+
+
+def is_auth_cookie(cookie):
+    if GROWJO_AUTH_COOKIES:
+        return cookie["name"] in GROWJO_AUTH_COOKIES
+    return bool(AUTH_COOKIE_PATTERN.search(cookie["name"]))
+
+
+class GrowjoSessionStore:
+    """Authenticated Growjo session shared by every scraper in the process.
+
+    After one successful login the cookies and localStorage are saved (in
+    memory and on disk) and injected into other drivers, so new scrapers
+    skip the login form. Logins are serialized on their own lock so concurrent
+    workers wait for a single login instead of each submitting the form,
+    while reads of the saved state never wait for a browser.
+    """
+
+    def __init__(self, path=GROWJO_SESSION_PATH, max_age=GROWJO_SESSION_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._login_lock = threading.Lock()
+        self._state = self._load()
+        self.version = 1 if self._state else 0
+        self._stats = {"logins": 0, "injections": 0, "reuses": 0, "invalidations": 0}
+        self._http = None  # (version, requests.Session) carrying the saved cookies
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+            return state if state.get("cookies") else None
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, state):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(state, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[ERROR] Could not persist Growjo session: {str(e)}")
+
+    def is_valid(self):
+        """Cheap local check: saved, younger than max_age, and no auth cookie expired."""
+        state = self._state
+        if not state:
+            return False
+        now = time.time()
+        if now - state.get("saved_at", 0) > self.max_age:
+            return False
+        return all(cookie.get("expiry", now + 1) > now for cookie in state["cookies"] if is_auth_cookie(cookie))
+
+    def save(self, driver):
+        """Capture cookies and localStorage from a freshly logged-in driver."""
+        try:
+            local_storage = driver.execute_script("return Object.assign({}, window.localStorage);") or {}
+        except Exception:
+            local_storage = {}
+        driver.growjo_session_version = self.save_state(driver.get_cookies(), local_storage)
+
+    def save_state(self, cookies, local_storage=None):
+        """Store Selenium-format cookies and localStorage; returns the new session version."""
+        state = {"cookies": cookies, "local_storage": local_storage or {}, "saved_at": time.time()}
+        with self._lock:
+            self._state = state
+            self.version += 1
+            version = self.version
+        self._write(state)
+        return version
+
+    def playwright_cookies(self):
+        """Saved cookies in Playwright's add_cookies format."""
+        return [
+            {
+                "name": c["name"], "value": c["value"], "domain": c.get("domain", ".growjo.com"),
+                "path": c.get("path", "/"), "secure": c.get("secure", False), "httpOnly": c.get("httpOnly", False),
+                "expires": c.get("expiry", -1),
+                **({"sameSite": c["sameSite"]} if c.get("sameSite") in ("Strict", "Lax", "None") else {}),
+            }
+            for c in (self._state or {}).get("cookies", [])
+        ]
+
+    def local_storage(self):
+        """Saved localStorage as {key: value}."""
+        return dict((self._state or {}).get("local_storage") or {})
+
+    def local_storage_script(self):
+        """Init script restoring the saved localStorage on Growjo pages."""
+        return _LOCAL_STORAGE_SCRIPT % json.dumps((self._state or {}).get("local_storage") or {})
+
+    def invalidate(self, version=None):
+        """Drop the saved session (only if it is still the version the caller saw expire)."""
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            self._state = None
+            self.version += 1
+            self._stats["invalidations"] += 1
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def _snapshot(self):
+        """(state, version) of a valid session, read together; (None, version) otherwise."""
+        with self._lock:
+            return (self._state if self.is_valid() else None), self.version
+
+    def inject(self, driver, state=None, version=None):
+        if state is None:
+            state, version = self._snapshot()
+        cookies = [
+            {
+                "name": c["name"], "value": c["value"], "domain": c.get("domain", ".growjo.com"),
+                "path": c.get("path", "/"), "secure": c.get("secure", False), "httpOnly": c.get("httpOnly", False),
+                **({"expires": c["expiry"]} if "expiry" in c else {}),
+                **({"sameSite": c["sameSite"]} if c.get("sameSite") in ("Strict", "Lax", "None") else {}),
+            }
+            for c in state["cookies"]
+        ]
+        storage_script = _LOCAL_STORAGE_SCRIPT % json.dumps(state.get("local_storage") or {})
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": storage_script})
+        except Exception:
+            # No CDP (e.g. a non-Chromium remote driver): set cookies from a Growjo page instead
+            driver.get(GROWJO_BASE_URL)
+            for cookie in state["cookies"]:
+                driver.add_cookie({k: v for k, v in cookie.items() if k != "sameSite"})
+            driver.execute_script(storage_script)
+        driver.growjo_session_version = version
+
+    def _reuse(self, driver):
+        """Inject the saved session into driver; False when there is no valid one."""
+        state, version = self._snapshot()
+        if state is None:
+            return False
+        print("[DEBUG] Reusing saved Growjo session.")
+        self.inject(driver, state, version)
+        with self._lock:
+            self._stats["injections"] += 1
+        return True
+
+    def ensure_logged_in(self, driver, login):
+        """Make `driver` authenticated, logging in with login(driver) only when no valid session exists."""
+        if self._state and getattr(driver, "growjo_session_version", None) == self.version:
+            with self._lock:
+                self._stats["reuses"] += 1
+            return
+        if self._reuse(driver):
+            return
+
+        with self._login_lock:
+            # Another worker may have logged in while we waited
+            if self._reuse(driver):
+                return
+            print("[DEBUG] No valid Growjo session, logging in.")
+            login(driver)
+            self.save(driver)
+            with self._lock:
+                self._stats["logins"] += 1
+
+    def http_session(self):
+        """Pooled requests.Session holding the saved login cookies, or None without a valid session.
+
+        Rebuilt whenever the session version changes, so a re-login is picked up.
+        """
+        with self._lock:
+            if not self.is_valid():
+                return None
+            if self._http is None or self._http[0] != self.version:
+                session = new_session()
+                for cookie in self._state["cookies"]:
+                    session.cookies.set(cookie["name"], cookie["value"],
+                                        domain=cookie.get("domain", ".growjo.com"), path=cookie.get("path", "/"))
+                session.growjo_session_version = self.version
+                self._http = (self.version, session)
+            return self._http[1]
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, valid=self.is_valid(), version=self.version)
+
+
+growjo_session = GrowjoSessionStore()
@@ -0,0 +1,182 @@
+import os
+import json
+import threading
+from urllib.parse import urlparse
+
+# Block images, fonts, media and trackers in scraper browsers; text extraction needs none of them
+RESOURCE_BLOCKING = os.getenv("RESOURCE_BLOCKING", "true").lower() in ("1", "true", "yes")
+# Per-site allow-list overrides, e.g. "growjo.com=image,*.svg;yellowpages.com=font"
+RESOURCE_BLOCK_ALLOW = os.getenv("RESOURCE_BLOCK_ALLOW", "")
+
+BLOCKED_EXTENSIONS = {
+    "image": ["png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "bmp", "avif"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "media": ["mp4", "webm", "mp3", "ogg", "wav", "m3u8"],
+}
+# Tracker hosts to block, shipped next to this module; a host matches a listed domain or any subdomain of it
+TRACKER_DOMAINS_FILE = os.getenv(
+    "TRACKER_DOMAINS_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "tracker_domains.txt")
+)
+# Allow-list entries are resource kinds ("image", "font", "media", "tracker") or raw URL patterns
+SITE_ALLOW = {
+    "growjo.com": [],
+}
+# Typical transfer size per blocked request, used to estimate bandwidth saved
+ESTIMATED_BYTES = {"Image": 40_000, "Font": 60_000, "Media": 500_000, "Script": 30_000}
+DEFAULT_ESTIMATED_BYTES = 20_000
+
+
+def load_tracker_domains(path=TRACKER_DOMAINS_FILE):
+    """Tracker domains from the list file (one per line, # comments); raises if it is missing or empty."""
+    try:
+        with open(path) as f:
+            domains = [line.strip().lower() for line in f if line.strip() and not line.lstrip().startswith("#")]
+    except OSError as e:
+        raise RuntimeError(f"Cannot read tracker list {path} (set TRACKER_DOMAINS_FILE or RESOURCE_BLOCKING=false): {e}")
+    if not domains:
+        raise RuntimeError(f"Tracker list {path} is empty")
+    return domains
+
+
+TRACKER_DOMAINS = load_tracker_domains() if RESOURCE_BLOCKING else []
+
+
+def is_tracker_url(url):
+    """True when the URL's host is a tracker domain or one of its subdomains."""
+    host = (urlparse(url).hostname or "").lower()
+    return any(host == domain or host.endswith("." + domain) for domain in TRACKER_DOMAINS)
+
+
+def _allow_overrides():
+    overrides = {}
+    for entry in filter(None, (part.strip() for part in RESOURCE_BLOCK_ALLOW.split(";"))):
+        site, _, allowed = entry.partition("=")
+        overrides[site.strip()] = [item.strip() for item in allowed.split(",") if item.strip()]
+    return overrides
+
+
+def site_allow_list(site):
+    return SITE_ALLOW.get(site, []) + _allow_overrides().get(site, [])
+
+
+def blocked_url_patterns(site=None):
+    """Network.setBlockedURLs patterns for a site, minus its allow-list."""
+    allowed = set(site_allow_list(site)) if site else set()
+    patterns = []
+    for kind, extensions in BLOCKED_EXTENSIONS.items():
+        if kind in allowed:
+            continue
+        for ext in extensions:
+            patterns += [f"*.{ext}", f"*.{ext}?*"]
+    if "tracker" not in allowed:
+        # Host patterns only: a tracker name elsewhere in a URL (e.g. a query string) must not match
+        for domain in TRACKER_DOMAINS:
+            patterns += [f"*://{domain}/*", f"*://*.{domain}/*"]
+    return [pattern for pattern in patterns if pattern not in allowed]
+
+
+def enable_network_log(options):
+    """Ask a Chromium driver to log network events so blocked requests can be counted."""
+    vendor = options.KEY.split(":")[0]  # "goog" for Chrome, "ms" for Edge
+    options.set_capability(f"{vendor}:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+def apply_blocking(driver, site=None):
+    """Install the blocking profile on a Chromium driver through CDP; returns False if unsupported."""
+    if not RESOURCE_BLOCKING:
+        return False
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_url_patterns(site)})
+        driver.resource_site = site
+        return True
+    except Exception as e:
+        print(f"[DEBUG] Resource blocking unavailable: {str(e)}")
+        return False
+
+
+class BlockingStats:
+    """Process-wide totals of requests blocked and bytes saved by the blocking profile."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {"navigations": 0, "blocked_requests": 0, "loaded_requests": 0,
+                        "loaded_bytes": 0, "estimated_bytes_saved": 0}
+        self._by_type = {}
+
+    def record(self, report):
+        with self._lock:
+            self._totals["navigations"] += 1
+            for key in ("blocked_requests", "loaded_requests", "loaded_bytes", "estimated_bytes_saved"):
+                self._totals[key] += report[key]
+            for resource_type, count in report["blocked_by_type"].items():
+                self._by_type[resource_type] = self._by_type.get(resource_type, 0) + count
+
+    def add_blocked(self, resource_type):
+        """Count one request blocked outside a CDP navigation report (Playwright routes)."""
+        with self._lock:
+            self._totals["blocked_requests"] += 1
+            self._totals["estimated_bytes_saved"] += ESTIMATED_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+            self._by_type[resource_type] = self._by_type.get(resource_type, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._totals, enabled=RESOURCE_BLOCKING, blocked_by_type=dict(self._by_type))
+
+
+blocking_stats = BlockingStats()
+
+
+def report_navigation(driver, url=None):
+    """Count requests blocked and bytes loaded since the last report from the driver's network log."""
+    if not RESOURCE_BLOCKING or not getattr(driver, "resource_site", None):
+        return None
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return None
+
+    report = {"blocked_requests": 0, "loaded_requests": 0, "loaded_bytes": 0,
+              "estimated_bytes_saved": 0, "blocked_by_type": {}}
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        params = message.get("params", {})
+        if message.get("method") == "Network.loadingFailed" and params.get("blockedReason"):
+            resource_type = params.get("type", "Other")
+            report["blocked_requests"] += 1
+            report["blocked_by_type"][resource_type] = report["blocked_by_type"].get(resource_type, 0) + 1
+            report["estimated_bytes_saved"] += ESTIMATED_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+        elif message.get("method") == "Network.loadingFinished":
+            report["loaded_requests"] += 1
+            report["loaded_bytes"] += int(params.get("encodedDataLength", 0))
+
+    blocking_stats.record(report)
+    driver.last_navigation_report = report
+    if report["blocked_requests"]:
+        print(f"[DEBUG] Blocked {report['blocked_requests']} requests "
+              f"(~{report['estimated_bytes_saved'] // 1024} KB saved) on {url or driver.current_url}")
+    return report
+
+
+def playwright_route_handler(site=None):
+    """Async Playwright route handler applying the same profile by resource type and tracker host."""
+    allowed = set(site_allow_list(site)) if site else set()
+    blocked_types = set(BLOCKED_EXTENSIONS) - allowed
+    block_trackers = "tracker" not in allowed
+
+    async def handle(route):
+        request = route.request
+        blocked = request.resource_type in blocked_types or (
+            block_trackers and is_tracker_url(request.url))
+        if blocked:
+            blocking_stats.add_blocked(request.resource_type.capitalize())
+            await route.abort("blockedbyclient")
+        else:
+            await route.continue_()
+
+    return handle
@@ -0,0 +1,83 @@
+import os
+import time
+import threading
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+# Upper bound for waits on required elements (rows, fields, redirects)
+GROWJO_WAIT_TIMEOUT = float(os.getenv("GROWJO_WAIT_TIMEOUT", 10))
+# Upper bound for "let the page settle" waits after scrolling or clicking
+GROWJO_SETTLE_TIMEOUT = float(os.getenv("GROWJO_SETTLE_TIMEOUT", 3))
+# How long the DOM / network must stay quiet to count as settled
+GROWJO_QUIET_PERIOD = float(os.getenv("GROWJO_QUIET_PERIOD", 0.4))
+WAIT_POLL_INTERVAL = 0.1
+
+_DOM_SETTLED_JS = """
+if (!window.__leadgenObserver) {
+    window.__leadgenLastMutation = performance.now();
+    window.__leadgenObserver = new MutationObserver(() => { window.__leadgenLastMutation = performance.now(); });
+    window.__leadgenObserver.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+    return false;
+}
+return performance.now() - window.__leadgenLastMutation >= arguments[0];
+"""
+
+
+def dom_settled(quiet=GROWJO_QUIET_PERIOD):
+    """True once no DOM mutation has been observed for `quiet` seconds."""
+    return lambda driver: driver.execute_script(_DOM_SETTLED_JS, quiet * 1000)
+
+
+class WaitLog:
+    """Thread-safe record of how long each wait actually took."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = []
+
+    def record(self, label, seconds, satisfied):
+        with self._lock:
+            self._records.append((label, seconds, satisfied))
+
+    def reset(self):
+        with self._lock:
+            self._records = []
+
+    def summary(self):
+        with self._lock:
+            records = list(self._records)
+        by_label = {}
+        for label, seconds, _ in records:
+            by_label[label] = round(by_label.get(label, 0) + seconds, 3)
+        return {
+            "total_seconds": round(sum(seconds for _, seconds, _ in records), 3),
+            "count": len(records),
+            "timeouts": sum(1 for _, _, satisfied in records if not satisfied),
+            "by_label": by_label,
+        }
+
+
+class RecordedWait(WebDriverWait):
+    """WebDriverWait that logs the real time spent in every wait."""
+
+    def __init__(self, driver, timeout=GROWJO_WAIT_TIMEOUT, log=None, poll_frequency=WAIT_POLL_INTERVAL):
+        super().__init__(driver, timeout, poll_frequency=poll_frequency)
+        self.log = log if log is not None else WaitLog()
+
+    def until(self, method, message="", label=None, timeout=None):
+        waiter = WebDriverWait(self._driver, self._timeout if timeout is None else timeout, poll_frequency=self._poll)
+        start = time.monotonic()
+        satisfied = False
+        try:
+            result = waiter.until(method, message)
+            satisfied = True
+            return result
+        finally:
+            self.log.record(label or getattr(method, "__name__", "wait"), time.monotonic() - start, satisfied)
+
+    def settle(self, label, condition=None, timeout=GROWJO_SETTLE_TIMEOUT):
+        """Best-effort wait for the page to go quiet; returns False instead of raising on timeout."""
+        try:
+            return self.until(condition or dom_settled(), label=label, timeout=timeout)
+        except TimeoutException:
+            return False
@@ -0,0 +1,51 @@
+import json
+from flask import Response, request, stream_with_context, jsonify
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+SSE_MIMETYPE = "text/event-stream"
+
+
+def requested_stream_format():
+    """Return 'ndjson', 'sse' or None from the ?stream= flag or the Accept header."""
+    flag = (request.args.get("stream") or "").strip().lower()
+    if flag in ("ndjson", "sse"):
+        return flag
+    if flag in ("1", "true", "yes"):
+        return "ndjson"
+
+    # Only honour explicit media types; a bare */* keeps the plain JSON response
+    accept = request.headers.get("Accept", "")
+    if SSE_MIMETYPE in accept:
+        return "sse"
+    if NDJSON_MIMETYPE in accept:
+        return "ndjson"
+    return None
+
+
+def stream_response(records, fmt):
+    """Emit each (index, record) pair as soon as it is produced."""
+    def generate():
+        for idx, record in records:
+            payload = json.dumps(dict(record, index=idx))
+            if fmt == "sse":
+                yield f"data: {payload}\n\n"
+            else:
+                yield payload + "\n"
+        if fmt == "sse":
+            yield "event: end\ndata: {}\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=SSE_MIMETYPE if fmt == "sse" else NDJSON_MIMETYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def batch_response(records):
+    """Stream (index, record) pairs if the client asked for it, else return one ordered JSON array."""
+    fmt = requested_stream_format()
+    if fmt:
+        return stream_response(records, fmt)
+
+    collected = sorted(records, key=lambda pair: pair[0])
+    return jsonify([record for _, record in collected]), 200
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The backend is run from its own directory (api.py imports coalesce, scraper.x, ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,42 @@
+from batching import run_batch
+
+
+def square(item):
+    if item < 0:
+        raise ValueError(f"negative: {item}")
+    return {"value": item * item}
+
+
+def test_run_batch_yields_every_index():
+    results = dict(run_batch(square, [1, 2, 3], max_workers=2))
+    assert results == {0: {"value": 1}, 1: {"value": 4}, 2: {"value": 9}}
+
+
+def test_run_batch_isolates_errors_per_item():
+    results = dict(run_batch(square, [1, -2, 3], max_workers=3))
+    assert results[0] == {"value": 1}
+    assert results[1] == {"error": "negative: -2"}
+    assert results[2] == {"value": 9}
+
+
+def test_run_batch_uses_on_error():
+    on_error = lambda item, exc: {"item": item, "error": type(exc).__name__}
+    results = dict(run_batch(square, [-1, 2], on_error=on_error))
+    assert results == {0: {"item": -1, "error": "ValueError"}, 1: {"value": 4}}
+
+
+def test_run_batch_dispatches_duplicates_once():
+    calls = []
+
+    def work(item):
+        calls.append(item)
+        return {"value": item.lower()}
+
+    results = dict(run_batch(work, ["A", "a", "B", "A"], key=str.lower))
+    assert sorted(calls) == ["A", "B"]
+    assert results == {0: {"value": "a"}, 1: {"value": "a"}, 2: {"value": "b"}, 3: {"value": "a"}}
+    assert results[0] is not results[1]
+
+
+def test_run_batch_with_no_items():
+    assert list(run_batch(square, [])) == []
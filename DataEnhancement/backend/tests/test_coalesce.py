@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+
+from coalesce import SingleFlight, canonical_company, canonical_domain, group_duplicates
+
+
+def test_group_duplicates_keeps_first_seen_order():
+    items = ["b.com", "a.com", "B.com", "c.com", "a.com"]
+    groups = group_duplicates(items, key=str.lower)
+    assert list(groups.values()) == [[0, 2], [1, 4], [3]]
+
+
+def test_group_duplicates_never_merges_none_keys():
+    items = ["", "acme.com", "", None]
+    groups = group_duplicates(items, key=canonical_domain)
+    assert list(groups.values()) == [[0], [1], [2], [3]]
+
+
+def test_canonical_keys():
+    assert canonical_domain("https://www.Acme.com/about") == canonical_domain("acme.com")
+    assert canonical_domain("") is None
+    assert canonical_domain(42) is None
+    assert canonical_company("Smith & Co.") == "smith and co"
+    assert canonical_company("  ") is None
+
+
+def test_do_runs_once_for_concurrent_callers():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"value": 1}
+
+    results = []
+    owner = threading.Thread(target=lambda: results.append(flight.do("k", work)))
+    owner.start()
+    assert started.wait(5)
+    waiters = [threading.Thread(target=lambda: results.append(flight.do("k", work))) for _ in range(3)]
+    for thread in waiters:
+        thread.start()
+    while flight.stats()["coalesced"] < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in [owner] + waiters:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [{"value": 1}] * 4
+    # Every caller gets its own copy
+    assert len({id(result) for result in results}) == 4
+    assert flight.stats() == {"calls": 4, "coalesced": 3, "in_flight": 0}
+
+
+def test_do_with_none_key_is_not_coalesced():
+    flight = SingleFlight()
+    assert flight.do(None, lambda: 1) == 1
+    assert flight.stats()["calls"] == 0
+
+
+def test_do_propagates_errors_and_releases_the_key():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do("k", lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert flight.do("k", lambda: 2) == 2
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_do_many_only_passes_keys_not_in_flight():
+    flight = SingleFlight()
+    call, owner = flight.join("a")
+    assert owner
+
+    seen = []
+
+    def bulk(keys):
+        seen.append(keys)
+        return {key: key.upper() for key in keys}
+
+    results = {}
+    thread = threading.Thread(target=lambda: results.update(flight.do_many(["a", "b", "b", "c"], bulk)))
+    thread.start()
+    while flight.stats()["coalesced"] < 1:
+        time.sleep(0.01)
+    flight.finish("a", call, result="from-a")
+    thread.join(5)
+
+    assert seen == [["b", "c"]]
+    assert results == {"a": "from-a", "b": "B", "c": "C"}
+
+
+def test_join_and_finish_hand_the_result_to_waiters():
+    flight = SingleFlight()
+    call, owner = flight.join("k")
+    same, second_owner = flight.join("k")
+    assert owner and not second_owner
+    assert same is call
+    assert SingleFlight.wait(same, timeout=0.01) is None
+
+    result = {"people": ["a"]}
+    flight.finish("k", call, result=result)
+    result["people"].append("b")
+    assert SingleFlight.wait(same) == {"people": ["a"]}
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_finish_with_error_raises_in_waiters():
+    flight = SingleFlight()
+    call, _ = flight.join("k")
+    flight.finish("k", call, error=RuntimeError("login failed"))
+    with pytest.raises(RuntimeError, match="login failed"):
+        SingleFlight.wait(call)
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+from flask import Flask
+
+from streaming import batch_response
+
+RECORDS = [(1, {"domain": "b.com"}), (0, {"domain": "a.com"})]
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+def test_plain_json_is_ordered_by_index(app):
+    with app.test_request_context("/"):
+        response, status = batch_response(iter(RECORDS))
+        assert status == 200
+        assert response.get_json() == [{"domain": "a.com"}, {"domain": "b.com"}]
+
+
+@pytest.mark.parametrize("path, headers", [
+    ("/?stream=ndjson", {}),
+    ("/?stream=1", {}),
+    ("/", {"Accept": "application/x-ndjson"}),
+])
+def test_ndjson_streams_records_as_produced(app, path, headers):
+    with app.test_request_context(path, headers=headers):
+        response = batch_response(iter(RECORDS))
+        assert response.mimetype == "application/x-ndjson"
+        lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"domain": "b.com", "index": 1},
+        {"domain": "a.com", "index": 0},
+    ]
+
+
+@pytest.mark.parametrize("path, headers", [
+    ("/?stream=sse", {}),
+    ("/", {"Accept": "text/event-stream"}),
+])
+def test_sse_frames_each_record_and_ends(app, path, headers):
+    with app.test_request_context(path, headers=headers):
+        response = batch_response(iter(RECORDS))
+        assert response.mimetype == "text/event-stream"
+        assert response.headers["Cache-Control"] == "no-cache"
+        text = response.get_data(as_text=True)
+    assert text == (
+        'data: {"domain": "b.com", "index": 1}\n\n'
+        'data: {"domain": "a.com", "index": 0}\n\n'
+        "event: end\ndata: {}\n\n"
+    )
+
+
+def test_wildcard_accept_keeps_plain_json(app):
+    with app.test_request_context("/", headers={"Accept": "*/*"}):
+        response, _ = batch_response(iter(RECORDS))
+        assert response.is_json
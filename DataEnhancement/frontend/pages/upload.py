@@ -4,6 +4,7 @@ from streamlit_cookies_controller import CookieController
 import pandas as pd
 import requests
 import jwt
+import json
 import time
 from config import BACKEND_URL
 
@@ -44,20 +45,6 @@ def auth_headers():
 def normalize_name(name):
     return name.strip().lower().replace(" ", "").replace("-", "").replace(".", "") if name else ""
 
-def split_name(full_name):
-    parts = full_name.strip().split()
-    if len(parts) == 0:
-        return "", ""
-    elif len(parts) == 1:
-        return parts[0], ""
-    else:
-        return parts[0], " ".join(parts[1:])
-
-def normalize_website(website):
-    if pd.isna(website) or not isinstance(website, str):
-        return ""
-    return website.replace("http://", "").replace("https://", "").replace("www.", "").strip().lower()
-
 def revenue_to_number(revenue_str):
     """Convert revenue like '500K', '2M', '$1.2B' to a numeric float."""
     if not isinstance(revenue_str, str) or revenue_str.strip() == "":
@@ -179,98 +166,40 @@ if st.session_state.normalized_df is not None and st.session_state.confirmed_sel
         mask = base_df["Company"].notnull()
         rows_to_update = base_df[mask].copy()
 
-        apollo_domains = rows_to_update["Website"].dropna().unique().tolist()
-        apollo_domains = [w.replace("http://", "").replace("https://", "").replace("www.", "").strip().lower() for w in apollo_domains]
- 
-        apollo_person_response = requests.post(
-            f"{BACKEND_URL}/api/find-best-person-batch",
-            json={"domains": apollo_domains},
-            headers=auth_headers()
+        # One backend call: Apollo org, Apollo person and Growjo run concurrently
+        # per row and merged records stream back as each row completes
+        row_labels = list(rows_to_update.index)
+        enrich_rows = rows_to_update.fillna("").astype(str).to_dict(orient="records")
+
+        enrich_response = requests.post(
+            f"{BACKEND_URL}/api/enrich-batch",
+            params={"stream": "ndjson"},
+            json={"rows": enrich_rows},
+            headers=auth_headers(),
+            stream=True
         )
-        if apollo_person_response.status_code == 200:
+        if enrich_response.status_code != 200:
+            st.error(f"❌ Enrichment API failed: {enrich_response.status_code} {enrich_response.text}")
+            st.stop()
+
+        completed = 0
+        for line in enrich_response.iter_lines():
+            if not line:
+                continue
             try:
-                apollo_person_data = apollo_person_response.json()
-                apollo_person_lookup = {r["domain"]: r for r in apollo_person_data if "domain" in r}
-            except Exception as e:
-                st.error(f"❌ Failed to parse Apollo person JSON: {e}")
-                apollo_person_lookup = {}
-        else:
-            st.error(f"❌ Apollo person batch API failed: {apollo_person_response.status_code} {apollo_person_response.text}")
-            apollo_person_lookup = {}
-
-        apollo_response = requests.post(
-            f"{BACKEND_URL}/api/apollo-scrape-batch",
-            json={"domains": apollo_domains}
-        )
-        apollo_lookup = {r["domain"]: r for r in apollo_response.json() if "domain" in r}
-
-        # Prepare list for batch call
-        growjo_request = [{"company": row["Company"]} for idx, row in rows_to_update.iterrows()]
-
-        # Send batch request
-        growjo_response = requests.post(
-            f"{BACKEND_URL}/api/scrape-growjo-batch",
-            json=growjo_request,
-            headers=auth_headers()
-        )
-        growjo_results = {item["company"].lower(): item for item in growjo_response.json() if "company" in item}
-
-
-        for i, (idx, row) in enumerate(rows_to_update.iterrows()):
-            domain_apollo = normalize_website(row.get("Website"))
-            domain = row["Company"]
-            apollo = apollo_lookup.get(domain_apollo, {})
-            apollo_person = apollo_person_lookup.get(domain_apollo, {})
-            growjo = growjo_results.get(domain.lower(), {})
-            print(growjo.get(domain.lower()))
-
-
-
-            if not row["Revenue"].strip():
-                revenue = apollo.get('annual_revenue_printed', '')
-                if revenue:
-                    rows_to_update.at[idx, "Revenue"] = f"${revenue}"
-                    rows_to_update.at[idx, "Rev Source"] = "Apollo"
-                else:
-                    rows_to_update.at[idx, "Revenue"] = ""
-                    rows_to_update.at[idx, "Rev Source"] = ""
-
-            if not row["Year Founded"].strip():
-                rows_to_update.at[idx, "Year Founded"] = apollo.get("founded_year", "")
-            if not normalize_website(row.get("Website")):
-                rows_to_update.at[idx, "Website"] = apollo.get("website_url", "")
-            if not row["LinkedIn URL"].strip():
-                rows_to_update.at[idx, "LinkedIn URL"] = apollo.get("linkedin_url", "") 
-            if not row["Industry "].strip():
-                rows_to_update.at[idx, "Industry "] = ""
-            if not row["Associated Members"].strip():
-                rows_to_update.at[idx, "Associated Members"] = ""
-            if not row["Employees count"].strip():
-                rows_to_update.at[idx, "Employees count"] = apollo.get("employee_count", "")
-            if not row["Product/Service Category"].strip():
-                rows_to_update.at[idx, "Product/Service Category"] = apollo.get("keywords", "")
-
-            if not row["Email"].strip():
-                rows_to_update.at[idx, "Email"] = growjo.get("decider_email", "") or apollo_person.get("email")
-            if not row["Phone Number"].strip(): 
-                rows_to_update.at[idx, "Phone Number"] = growjo.get("decider_phone", "") or apollo_person.get("phone_number")
-            if not row["Owner's LinkedIn"].strip():
-                rows_to_update.at[idx, "Owner's LinkedIn"] = growjo.get("decider_linkedin", "") or apollo_person.get("linkedin_url")
-            if not row["Title"].strip():
-                rows_to_update.at[idx, "Title"] = growjo.get("decider_title", "") or apollo_person.get("title")
-            if not row["Industry "].strip():
-                rows_to_update.at[idx, "Industry "] = growjo.get("industry", "")
-
-            decider_name = growjo.get("decider_name", "")
-            first_name, last_name = split_name(decider_name)
-
-            if not row["First Name"].strip():
-                rows_to_update.at[idx, "First Name"] = first_name or apollo_person.get("first_name", "")
-            if not row["Last Name"].strip():
-                rows_to_update.at[idx, "Last Name"] = last_name or apollo_person.get("last_name", "")
-
-            progress_bar.progress((i + 1) / len(rows_to_update))
-            status_text.text(f"Enhanced {i + 1} of {len(rows_to_update)} rows")
+                record = json.loads(line)
+            except ValueError as e:
+                st.error(f"❌ Failed to parse enrichment record: {e}")
+                continue
+
+            idx = row_labels[record.pop("index")]
+            for col, value in record.items():
+                if col in rows_to_update.columns:
+                    rows_to_update.at[idx, col] = value
+
+            completed += 1
+            progress_bar.progress(completed / len(rows_to_update))
+            status_text.text(f"Enhanced {completed} of {len(rows_to_update)} rows")
 
         enhanced_df.update(rows_to_update)
 
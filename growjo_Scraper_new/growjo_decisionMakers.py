@@ -10,6 +10,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 import csv
+from resource_blocking import RESOURCE_BLOCKING, apply_blocking, enable_network_log, report_navigation
 
 GROWJO_SEARCH_URL = "https://growjo.com/"
 
@@ -26,13 +27,17 @@ class GrowjoCompanyDetailsScraper:
         edge_options.add_argument("--disable-dev-shm-usage")
         edge_options.add_argument("--disable-gpu")
         edge_options.add_argument("--window-size=1920,1080")
+        if RESOURCE_BLOCKING:
+            enable_network_log(edge_options)
         self.driver = webdriver.Edge(options=edge_options)
         self.driver.maximize_window()
+        apply_blocking(self.driver, "growjo.com")
 
     def search_company(self, company_name):
         try:
             print(f"\n[DEBUG] Searching for company: '{company_name}'")
             self.driver.get(GROWJO_SEARCH_URL)
+            report_navigation(self.driver, GROWJO_SEARCH_URL)
             time.sleep(3)
             try:
                 print("[DEBUG] Trying search box by placeholder XPATH...")
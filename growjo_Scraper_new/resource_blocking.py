@@ -0,0 +1,85 @@
+import os
+import json
+
+# Block images, fonts, media and trackers in the scraper browser; text extraction needs none of them
+RESOURCE_BLOCKING = os.getenv("RESOURCE_BLOCKING", "true").lower() in ("1", "true", "yes")
+# Tracker hosts to block, shipped next to this module; a host matches a listed domain or any subdomain of it
+TRACKER_DOMAINS_FILE = os.getenv(
+    "TRACKER_DOMAINS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "tracker_domains.txt")
+)
+
+BLOCKED_EXTENSIONS = ["png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "bmp", "avif",
+                      "woff", "woff2", "ttf", "otf", "eot", "mp4", "webm", "mp3", "ogg", "wav", "m3u8"]
+# Typical transfer size per blocked request, used to estimate bandwidth saved
+ESTIMATED_BYTES = {"Image": 40_000, "Font": 60_000, "Media": 500_000, "Script": 30_000}
+DEFAULT_ESTIMATED_BYTES = 20_000
+
+
+def load_tracker_domains(path=TRACKER_DOMAINS_FILE):
+    """Tracker domains from the list file (one per line, # comments); raises if it is missing or empty."""
+    try:
+        with open(path) as f:
+            domains = [line.strip().lower() for line in f if line.strip() and not line.lstrip().startswith("#")]
+    except OSError as e:
+        raise RuntimeError(f"Cannot read tracker list {path} (set TRACKER_DOMAINS_FILE or RESOURCE_BLOCKING=false): {e}")
+    if not domains:
+        raise RuntimeError(f"Tracker list {path} is empty")
+    return domains
+
+
+TRACKER_DOMAINS = load_tracker_domains() if RESOURCE_BLOCKING else []
+
+
+def blocked_url_patterns():
+    """Network.setBlockedURLs patterns: heavy resources by extension, trackers by host."""
+    patterns = []
+    for ext in BLOCKED_EXTENSIONS:
+        patterns += [f"*.{ext}", f"*.{ext}?*"]
+    for domain in TRACKER_DOMAINS:
+        patterns += [f"*://{domain}/*", f"*://*.{domain}/*"]
+    return patterns
+
+
+def enable_network_log(options):
+    """Ask the Edge driver to log network events so blocked requests can be counted."""
+    options.set_capability("ms:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+def apply_blocking(driver, site=None):
+    """Install the blocking profile on the driver through CDP; returns False if unsupported."""
+    if not RESOURCE_BLOCKING:
+        return False
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_url_patterns()})
+        driver.resource_site = site
+        return True
+    except Exception as e:
+        print(f"[DEBUG] Resource blocking unavailable: {str(e)}")
+        return False
+
+
+def report_navigation(driver, url=None):
+    """Print the requests blocked since the last report, read from the driver's network log."""
+    if not RESOURCE_BLOCKING or not getattr(driver, "resource_site", None):
+        return None
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return None
+
+    blocked = saved = 0
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        params = message.get("params", {})
+        if message.get("method") == "Network.loadingFailed" and params.get("blockedReason"):
+            blocked += 1
+            saved += ESTIMATED_BYTES.get(params.get("type", "Other"), DEFAULT_ESTIMATED_BYTES)
+
+    if blocked:
+        print(f"[DEBUG] Blocked {blocked} requests (~{saved // 1024} KB saved) on {url or driver.current_url}")
+    return {"blocked_requests": blocked, "estimated_bytes_saved": saved}
@@ -3,6 +3,7 @@ import time
 import random
 import csv
 import os
+from config.resource_blocking import install_sync, format_report
 
 def setup_browser(playwright):
     """Set up and return a configured Playwright browser instance."""
@@ -35,6 +36,9 @@ def setup_browser(playwright):
         bypass_csp=True,
     )
     
+    # Skip images, fonts, media and trackers; only the listing text is scraped
+    context.blocker = install_sync(context, "yellowpages.com")
+
     # Emulate a real browser by setting specific properties
     page = context.new_page()
     page.add_init_script("""
@@ -73,6 +77,8 @@ def scrape_yellowpages_playwright(search_term, location, max_pages=1):
                 
                 # Navigate to the page with a timeout
                 page.goto(url, wait_until='domcontentloaded', timeout=60000)
+                if context.blocker:
+                    print(format_report(context.blocker.navigation_report()))
                 
                 # Add random wait time to simulate human behavior
                 wait_time = random.uniform(3, 7)
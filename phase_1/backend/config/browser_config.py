@@ -1,32 +1,57 @@
+from typing import Dict, Optional
 from playwright.async_api import async_playwright
+from config.resource_blocking import install_async
+from config.cdp_attach import BROWSER_CDP_REGISTRY, live_browser, cdp_url
 
 class PlaywrightManager:
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, site: Optional[str] = None, attach: bool = bool(BROWSER_CDP_REGISTRY)):
         self.headless = headless
+        self.site = site  # Selects the resource-blocking allow-list
+        self.attach = attach  # Reuse a running browser from BROWSER_CDP_REGISTRY when one answers
+        self.attached = False
+        self.blocker = None
         self.playwright = None
         self.browser = None
         self.context = None
         self.page = None
         
     async def start_browser(self):
-        """Initialize the Playwright session and start the browser."""
+        """Initialize the Playwright session and start (or attach to) the browser."""
         self.playwright = await async_playwright().start()
+        entry = live_browser() if self.attach else None
+        if entry:
+            # Work in a page of our own inside the running browser's profile; block per page
+            # so the user's other tabs are left alone
+            self.browser = await self.playwright.chromium.connect_over_cdp(cdp_url(entry))
+            self.attached = True
+            self.context = self.browser.contexts[0] if self.browser.contexts else await self.browser.new_context()
+            self.page = await self.context.new_page()
+            self.blocker = await install_async(self.page, self.site)
+            return self.page
+
         self.browser = await self.playwright.chromium.launch(headless=self.headless)
         self.context = await self.browser.new_context()
+        self.blocker = await install_async(self.context, self.site)
         self.page = await self.context.new_page()
         return self.page
+
+    def navigation_report(self) -> Optional[Dict]:
+        """Requests blocked and bytes saved since the last report, or None if blocking is off."""
+        return self.blocker.navigation_report() if self.blocker else None
     
     async def stop_browser(self):
-        """Close the browser and stop the Playwright session."""
+        """Close the browser and stop the Playwright session (an attached browser is only disconnected)."""
         if self.page:
             await self.page.close()
             self.page = None
         if self.context:
-            await self.context.close()
+            if not self.attached:
+                await self.context.close()
             self.context = None
         if self.browser:
             await self.browser.close()
             self.browser = None
         if self.playwright:
             await self.playwright.stop()
-            self.playwright = None
\ No newline at end of file
+            self.playwright = None
+        self.attached = False
\ No newline at end of file
@@ -0,0 +1,52 @@
+import os
+import json
+from typing import Dict, List, Optional
+from urllib.request import urlopen
+
+# JSON file describing already-running browsers started with --remote-debugging-port,
+# e.g. {"port": 9222, "user_data_dir": "..."} or a list of such entries (optional "host")
+BROWSER_CDP_REGISTRY = os.getenv("BROWSER_CDP_REGISTRY", "")
+# Seconds to wait for a registered browser's /json/version before treating it as down
+BROWSER_CDP_PROBE_TIMEOUT = float(os.getenv("BROWSER_CDP_PROBE_TIMEOUT", 2))
+
+
+def load_registry(path: Optional[str] = None) -> List[Dict]:
+    """Registry entries as [{"host", "port", "user_data_dir"}]; [] when there is no registry."""
+    path = BROWSER_CDP_REGISTRY if path is None else path
+    if not path or not os.path.exists(path):
+        return []
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Could not read browser registry {path}: {e}")
+        return []
+
+    entries = []
+    for entry in data if isinstance(data, list) else [data]:
+        if isinstance(entry, dict) and entry.get("port"):
+            entries.append({"host": entry.get("host", "127.0.0.1"), "port": int(entry["port"]),
+                            "user_data_dir": entry.get("user_data_dir")})
+    return entries
+
+
+def cdp_url(entry: Dict) -> str:
+    return f"http://{entry['host']}:{entry['port']}"
+
+
+def probe(entry: Dict) -> Optional[Dict]:
+    """The browser's /json/version or None if nothing answers on its debugging port."""
+    try:
+        with urlopen(f"{cdp_url(entry)}/json/version", timeout=BROWSER_CDP_PROBE_TIMEOUT) as res:
+            return json.load(res)
+    except (OSError, ValueError):
+        return None
+
+
+def live_browser(path: Optional[str] = None) -> Optional[Dict]:
+    """First registered browser that answers on its debugging port, with its version info, or None."""
+    for entry in load_registry(path):
+        version = probe(entry)
+        if version:
+            return dict(entry, version=version)
+    return None
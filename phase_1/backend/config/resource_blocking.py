@@ -0,0 +1,145 @@
+import os
+import threading
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+# Block images, fonts, media and trackers; text extraction needs none of them
+RESOURCE_BLOCKING = os.getenv("RESOURCE_BLOCKING", "true").lower() in ("1", "true", "yes")
+# Per-site allow-list overrides, e.g. "yellowpages.com=image;google.com=font,tracker"
+RESOURCE_BLOCK_ALLOW = os.getenv("RESOURCE_BLOCK_ALLOW", "")
+
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+# Tracker hosts to block, shipped next to this module; a host matches a listed domain or any subdomain of it
+TRACKER_DOMAINS_FILE = os.getenv(
+    "TRACKER_DOMAINS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "tracker_domains.txt")
+)
+# Allow-list entries are resource types ("image", "font", "media") or "tracker"
+SITE_ALLOW: Dict[str, List[str]] = {
+    "google.com": ["image"],  # Maps renders its results panel over image tiles
+    "yellowpages.com": [],
+}
+# Typical transfer size per blocked request, used to estimate bandwidth saved
+ESTIMATED_BYTES = {"image": 40_000, "font": 60_000, "media": 500_000, "script": 30_000}
+DEFAULT_ESTIMATED_BYTES = 20_000
+
+
+def load_tracker_domains(path: str = TRACKER_DOMAINS_FILE) -> List[str]:
+    """Tracker domains from the list file (one per line, # comments); raises if it is missing or empty."""
+    try:
+        with open(path) as f:
+            domains = [line.strip().lower() for line in f if line.strip() and not line.lstrip().startswith("#")]
+    except OSError as e:
+        raise RuntimeError(f"Cannot read tracker list {path} (set TRACKER_DOMAINS_FILE or RESOURCE_BLOCKING=false): {e}")
+    if not domains:
+        raise RuntimeError(f"Tracker list {path} is empty")
+    return domains
+
+
+TRACKER_DOMAINS = load_tracker_domains() if RESOURCE_BLOCKING else []
+
+
+def is_tracker_url(url: str) -> bool:
+    """True when the URL's host is a tracker domain or one of its subdomains."""
+    host = (urlparse(url).hostname or "").lower()
+    return any(host == domain or host.endswith("." + domain) for domain in TRACKER_DOMAINS)
+
+
+def site_allow_list(site: Optional[str]) -> List[str]:
+    """Built-in allow-list for a site plus any RESOURCE_BLOCK_ALLOW override."""
+    if not site:
+        return []
+    allowed = list(SITE_ALLOW.get(site, []))
+    for entry in filter(None, (part.strip() for part in RESOURCE_BLOCK_ALLOW.split(";"))):
+        entry_site, _, items = entry.partition("=")
+        if entry_site.strip() == site:
+            allowed += [item.strip() for item in items.split(",") if item.strip()]
+    return allowed
+
+
+class ResourceBlocker:
+    """Playwright route handler that aborts unneeded requests and counts what it saved."""
+
+    def __init__(self, site: Optional[str] = None):
+        self.site = site
+        allowed = set(site_allow_list(site))
+        self.blocked_types = BLOCKED_RESOURCE_TYPES - allowed
+        self.block_trackers = "tracker" not in allowed
+        self._lock = threading.Lock()
+        self._navigation = self._empty_report()
+        self._totals = dict(self._empty_report(), navigations=0)
+
+    @staticmethod
+    def _empty_report() -> Dict:
+        return {"blocked_requests": 0, "allowed_requests": 0, "estimated_bytes_saved": 0, "blocked_by_type": {}}
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.blocked_types:
+            return True
+        return self.block_trackers and is_tracker_url(url)
+
+    def _count(self, resource_type: str, blocked: bool) -> None:
+        with self._lock:
+            if not blocked:
+                self._navigation["allowed_requests"] += 1
+                return
+            by_type = self._navigation["blocked_by_type"]
+            by_type[resource_type] = by_type.get(resource_type, 0) + 1
+            self._navigation["blocked_requests"] += 1
+            self._navigation["estimated_bytes_saved"] += ESTIMATED_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+
+    async def handle_async(self, route) -> None:
+        request = route.request
+        blocked = self.should_block(request.resource_type, request.url)
+        self._count(request.resource_type, blocked)
+        if blocked:
+            await route.abort("blockedbyclient")
+        else:
+            await route.continue_()
+
+    def handle_sync(self, route) -> None:
+        request = route.request
+        blocked = self.should_block(request.resource_type, request.url)
+        self._count(request.resource_type, blocked)
+        if blocked:
+            route.abort("blockedbyclient")
+        else:
+            route.continue_()
+
+    def navigation_report(self) -> Dict:
+        """Requests blocked and bytes saved since the previous report (call after each goto)."""
+        with self._lock:
+            report, self._navigation = self._navigation, self._empty_report()
+            self._totals["navigations"] += 1
+            for key in ("blocked_requests", "allowed_requests", "estimated_bytes_saved"):
+                self._totals[key] += report[key]
+            for resource_type, count in report["blocked_by_type"].items():
+                by_type = self._totals["blocked_by_type"]
+                by_type[resource_type] = by_type.get(resource_type, 0) + count
+        return report
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self._totals, blocked_by_type=dict(self._totals["blocked_by_type"]), site=self.site)
+
+
+async def install_async(context, site: Optional[str] = None) -> Optional[ResourceBlocker]:
+    """Route every request of an async BrowserContext (or Page) through a ResourceBlocker."""
+    if not RESOURCE_BLOCKING:
+        return None
+    blocker = ResourceBlocker(site)
+    await context.route("**/*", blocker.handle_async)
+    return blocker
+
+
+def install_sync(context, site: Optional[str] = None) -> Optional[ResourceBlocker]:
+    """Route every request of a sync BrowserContext (or Page) through a ResourceBlocker."""
+    if not RESOURCE_BLOCKING:
+        return None
+    blocker = ResourceBlocker(site)
+    context.route("**/*", blocker.handle_sync)
+    return blocker
+
+
+def format_report(report: Dict) -> str:
+    return (f"Blocked {report['blocked_requests']} requests "
+            f"(~{report['estimated_bytes_saved'] // 1024} KB saved), allowed {report['allowed_requests']}")
@@ -38,7 +38,7 @@ def save_to_csv(data: List[Dict[str, str]], file_path: str) -> None:
 
 async def scrape_lead_by_industry(industry: str, location: str) -> None:
     """Scrape multiple leads by industry from Google Maps."""
-    manager = PlaywrightManager(headless=False)
+    manager = PlaywrightManager(headless=False, site="google.com")
     try:
         page = await manager.start_browser()
         await page.goto(BASE_URL)